@@ -0,0 +1,47 @@
+"""Run a shard of the tests with --shard, see python -m utils test."""
+
+from __future__ import annotations
+
+import pytest
+from harness import load_test_durations, lpt_shards, record_test_durations
+
+_durations: dict[str, float] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--shard",
+        help="Only run shard K of N as K/N, balanced by the recorded test durations",
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if not (shard := config.getoption("shard")):
+        return
+    shard_num, num_shards = (int(part) for part in shard.split("/"))
+    recorded = load_test_durations()
+    # Tests that haven't been timed yet could be as slow as the slowest
+    unknown = max(recorded.values(), default=1.0)
+    shards = lpt_shards(
+        {item.name: recorded.get(item.name, unknown) for item in items}, num_shards
+    )
+    in_shard = set(shards[shard_num - 1])
+    config.hook.pytest_deselected(
+        items=[item for item in items if item.name not in in_shard]
+    )
+    items[:] = [item for item in items if item.name in in_shard]
+
+
+def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+    # Answers from the result cache took no time to solve
+    cached = ("cached", True) in report.user_properties
+    if report.when == "call" and report.passed and not cached:
+        _durations[report.nodeid.rpartition("::")[2]] = report.duration
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    if _durations:
+        record_test_durations(_durations)
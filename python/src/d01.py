@@ -4,8 +4,10 @@ Advent Of Code 2023 Day 01
 
 from __future__ import annotations
 
+import random
+import string
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Sequence
 
 import utils
 
@@ -20,7 +22,9 @@ digit_subsets_back = {
 }
 
 
-def get_calibration_values(lines: list[str], part2: bool) -> Generator[int, None, None]:
+def get_calibration_values(
+    lines: Sequence[str], part2: bool
+) -> Generator[int, None, None]:
     for line in lines:
         first = last = "0"
         poss_word = ""
@@ -61,12 +65,28 @@ def get_calibration_values(lines: list[str], part2: bool) -> Generator[int, None
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
-    words = input_file.read_text().splitlines()
+    words = utils.input_lines(input_file)
     return (
         sum(get_calibration_values(words, False)),
         sum(get_calibration_values(words, True)),
     )
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(max(1, round(1000 * scale))):
+        tokens = [
+            (
+                rng.choice(DIGIT_WORDS)
+                if rng.random() < 0.3
+                else "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 4)))
+            )
+            for _ in range(rng.randint(1, 5))
+        ]
+        tokens.insert(rng.randint(0, len(tokens)), str(rng.randint(1, 9)))
+        lines.append("".join(tokens))
+    return "\n".join(lines) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
@@ -5,6 +5,7 @@ Advent Of Code 2023 Day 02
 from __future__ import annotations
 
 import math
+import random
 from pathlib import Path
 from typing import NamedTuple
 
@@ -35,7 +36,7 @@ def get_game_ball_counts(ball_counts: str) -> list[GameBallCounts]:
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
     games = [
         get_game_ball_counts(line.split(":")[1].strip())
-        for line in input_file.read_text().splitlines()
+        for line in utils.input_lines(input_file)
     ]
 
     p1_limit = GameBallCounts(12, 13, 14)
@@ -56,5 +57,19 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
     return (sum(valid_games), sum(math.prod(gbc) for gbc in min_colours))
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    lines = []
+    for game in range(1, max(1, round(100 * scale)) + 1):
+        reveals = (
+            ", ".join(
+                f"{rng.randint(1, 20)} {colour}"
+                for colour in rng.sample(GameBallCounts._fields, rng.randint(1, 3))
+            )
+            for _ in range(rng.randint(1, 6))
+        )
+        lines.append(f"Game {game}: {'; '.join(reveals)}")
+    return "\n".join(lines) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
@@ -5,8 +5,9 @@ Advent Of Code 2023 Day 03
 from __future__ import annotations
 
 import math
+import random
 from pathlib import Path
-from typing import Iterable, NamedTuple
+from typing import Iterable, NamedTuple, Sequence
 
 import utils
 
@@ -22,7 +23,7 @@ class Coord(NamedTuple):
 
 
 def parse_input(
-    lines: list[str],
+    lines: Sequence[str],
 ) -> tuple[list[tuple[int, set[Coord]]], set[Coord], set[Coord]]:
     numbers = []
     symbols = set()
@@ -50,7 +51,7 @@ def parse_input(
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
-    numbers, symbols, poss_gears = parse_input(input_file.read_text().splitlines())
+    numbers, symbols, poss_gears = parse_input(utils.input_lines(input_file))
 
     part_numbers = (
         num for num, adjacent_coords in numbers if adjacent_coords & symbols
@@ -66,5 +67,22 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
     return (sum(part_numbers), sum(gear_ratios))
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    size = max(10, round(140 * math.sqrt(scale)))
+    lines = []
+    for _ in range(size):
+        line = ""
+        while len(line) < size:
+            roll = rng.random()
+            if roll < 0.1:
+                line += str(rng.randint(1, 999)) + "."
+            elif roll < 0.14:
+                line += rng.choice("*#+$/=%@&-")
+            else:
+                line += "."
+        lines.append(line[:size])
+    return "\n".join(lines) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
@@ -4,6 +4,7 @@ Advent Of Code 2023 Day 04
 
 from __future__ import annotations
 
+import random
 from pathlib import Path
 
 import utils
@@ -15,7 +16,7 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
             {int(num_str) for num_str in num_list.split()}
             for num_list in line.split(":")[1].split("|")
         ]
-        for line in input_file.read_text().splitlines()
+        for line in utils.input_lines(input_file)
     )
 
     matching_numbers = [len(winning_num & got_nums) for winning_num, got_nums in cards]
@@ -32,5 +33,24 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
     return (sum(scores), sum(num_of_each))
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    num_cards = max(1, round(200 * scale))
+    lines = []
+    for card in range(1, num_cards + 1):
+        numbers = rng.sample(range(1, 100), 35)
+        winning = numbers[:10]
+        # Few enough matches that the copies in part 2 don't grow exponentially,
+        # and no copies of cards past the end
+        num_matching = 0 if rng.random() < 0.65 else rng.randint(1, 4)
+        num_matching = min(num_matching, num_cards - card)
+        got = winning[:num_matching] + numbers[10 : 35 - num_matching]
+        rng.shuffle(got)
+        lines.append(
+            f"Card {card:3d}: {' '.join(f'{num:2d}' for num in winning)} | "
+            f"{' '.join(f'{num:2d}' for num in got)}"
+        )
+    return "\n".join(lines) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
@@ -4,8 +4,10 @@ Advent Of Code 2023 Day 05
 
 from __future__ import annotations
 
+import random
+from itertools import pairwise
 from pathlib import Path
-from typing import NamedTuple
+from typing import NamedTuple, Sequence
 
 import utils
 
@@ -68,7 +70,7 @@ def location_from_seed(seed: int, mappings: list[list[MapRange]]) -> int:
     return seed
 
 
-def parse(lines: list[str]) -> list[list[MapRange]]:
+def parse(lines: Sequence[str]) -> list[list[MapRange]]:
     mappings: list[list[MapRange]] = []
     ranges = []
     for line in lines:
@@ -87,9 +89,9 @@ def parse(lines: list[str]) -> list[list[MapRange]]:
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
-    lines = input_file.read_text().splitlines()
-    seeds = [int(token) for token in lines.pop(0).split(":")[1].split()]
-    mappings = parse(lines)
+    lines = utils.input_lines(input_file)
+    seeds = [int(token) for token in lines[0].split(":")[1].split()]
+    mappings = parse(lines[1:])
 
     p1 = min(location_from_seed(seed, mappings) for seed in seeds)
     seed_ranges = (
@@ -104,5 +106,35 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
     )
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    space = 2**32
+    seeds = []
+    for _ in range(10):
+        seeds += [rng.randrange(space - 2**28), rng.randint(1, 2**28)]
+    blocks = ["seeds: " + " ".join(str(seed) for seed in seeds)]
+    categories = (
+        "seed",
+        "soil",
+        "fertilizer",
+        "water",
+        "light",
+        "temperature",
+        "humidity",
+        "location",
+    )
+    for source, dest in pairwise(categories):
+        # Map a random partition of the space onto a shuffle of itself
+        num_ranges = max(2, round(30 * scale))
+        cuts = [0, *sorted(rng.sample(range(1, space), num_ranges - 1)), space]
+        sources = list(pairwise(cuts))
+        dest_st = 0
+        lines = [f"{source}-to-{dest} map:"]
+        for source_st, source_end in rng.sample(sources, len(sources)):
+            lines.append(f"{dest_st} {source_st} {source_end - source_st}")
+            dest_st += source_end - source_st
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
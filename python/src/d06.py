@@ -5,6 +5,7 @@ Advent Of Code 2023 Day 06
 from __future__ import annotations
 
 import math
+import random
 from pathlib import Path
 from typing import Generator
 
@@ -41,7 +42,7 @@ def get_nums(line: str) -> tuple[Generator[int, None, None], int]:
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
-    lines = input_file.read_text().splitlines()
+    lines = utils.input_lines(input_file)
     times, p2_time = get_nums(lines[0])
     distances, p2_dist = get_nums(lines[1])
 
@@ -52,5 +53,20 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
     return (math.prod(ways_to_win), get_ways_to_win(p2_time, p2_dist))
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    """Scale is ignored as part 2 joins all the races into one anyway."""
+    while True:
+        times = [rng.randint(40, 99) for _ in range(4)]
+        distances = [rng.randint(time**2 // 8, time**2 // 4 - 1) for time in times]
+        p2_time = int("".join(str(time) for time in times))
+        p2_dist = int("".join(str(distance) for distance in distances))
+        if p2_time**2 > 4 * p2_dist:  # Make sure part 2 can be won
+            break
+    return (
+        f"Time:     {' '.join(f'{time:5d}' for time in times)}\n"
+        f"Distance: {' '.join(f'{distance:5d}' for distance in distances)}\n"
+    )
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
@@ -5,6 +5,7 @@ Advent Of Code 2023 Day 07
 from __future__ import annotations
 
 import enum
+import random
 from collections import Counter
 from pathlib import Path
 from typing import NamedTuple
@@ -79,17 +80,33 @@ class Hand(NamedTuple):
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
-    hands = [Hand.from_line(line) for line in input_file.read_text().splitlines()]
+    with utils.phase("read"):
+        lines = utils.input_lines(input_file)
+    with utils.phase("parse"):
+        hands = [Hand.from_line(line) for line in lines]
+
+    with utils.phase("p1"):
+        p1 = sum(
+            (idx + 1) * hand.bid
+            for idx, hand in enumerate(sorted(hands, key=lambda hand: hand.p1_rank))
+        )
+    with utils.phase("p2"):
+        p2 = sum(
+            (idx + 1) * hand.bid
+            for idx, hand in enumerate(sorted(hands, key=lambda hand: hand.p2_rank))
+        )
+    return (p1, p2)
 
-    p1 = sum(
-        (idx + 1) * hand.bid
-        for idx, hand in enumerate(sorted(hands, key=lambda hand: hand.p1_rank))
-    )
-    p2 = sum(
-        (idx + 1) * hand.bid
-        for idx, hand in enumerate(sorted(hands, key=lambda hand: hand.p2_rank))
+
+def work_units(input_file: Path) -> tuple[int, str]:
+    return len(utils.input_lines(input_file)), "hands"
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    return "".join(
+        f"{''.join(rng.choices(CARD_ORDER, k=5))} {rng.randint(1, 1000)}\n"
+        for _ in range(max(1, round(1000 * scale)))
     )
-    return (p1, p2)
 
 
 if __name__ == "__main__":
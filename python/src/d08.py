@@ -5,6 +5,8 @@ Advent Of Code 2023 Day 8
 from __future__ import annotations
 
 import math
+import random
+import string
 from pathlib import Path
 from typing import Generator, NamedTuple
 
@@ -48,7 +50,7 @@ def get_loop_info(start: Node, md: MapData) -> int:
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
-    lines = input_file.read_text().splitlines()
+    lines = utils.input_lines(input_file)
     nodes = (Node.from_line(line) for line in lines[2:])
     md = MapData(
         [DIR_TO_IDX[dir] for dir in lines[0]], {node.name: node for node in nodes}
@@ -67,5 +69,45 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
     return (p1, p2)
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    # Each ghost goes round a ring of pairs of nodes, the directions decide
+    # which of the pair it visits, getting back to its Z node after a prime
+    # number of steps. So part 2 is the product of the primes.
+    ring_len = max(3, round(30 * scale))
+    primes = [
+        num
+        for num in range(3, 2 * ring_len + 20)
+        if all(num % div for div in range(2, math.isqrt(num) + 1))
+    ]
+    ring_lens = rng.sample(primes[-12:], 6)
+
+    used = {"AAA", "ZZZ"}
+    name_len = 3
+    while 26 ** (name_len - 1) * 24 < 4 * sum(ring_lens):
+        name_len += 1
+
+    def new_name(last: str = "BCDEFGHIJKLMNOPQRSTUVWXY") -> str:
+        while True:
+            name = "".join(rng.choices(string.ascii_uppercase, k=name_len - 1))
+            name += rng.choice(last)
+            if name not in used:
+                used.add(name)
+                return name
+
+    lines = []
+    for ghost, ring_len in enumerate(ring_lens):
+        start, end = ("AAA", "ZZZ") if ghost == 0 else (new_name("A"), new_name("Z"))
+        ring = [(end, end)] + [(new_name(), new_name()) for _ in range(ring_len - 1)]
+        for idx, pair in enumerate(ring):
+            next_pair = ring[(idx + 1) % ring_len]
+            for name in set(pair):
+                left, right = rng.sample(next_pair, 2)
+                lines.append(f"{name} = ({left}, {right})")
+        lines.append(f"{start} = ({ring[1][0]}, {ring[1][1]})")
+    rng.shuffle(lines)
+    directions = "".join(rng.choices("LR", k=rng.randint(200, 300)))
+    return directions + "\n\n" + "\n".join(lines) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
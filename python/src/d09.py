@@ -4,6 +4,7 @@ Advent Of Code 2023 Day 9
 
 from __future__ import annotations
 
+import random
 from pathlib import Path
 
 import utils
@@ -11,8 +12,7 @@ import utils
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
     value_histories = (
-        [int(token) for token in line.split()]
-        for line in input_file.read_text().splitlines()
+        [int(token) for token in line.split()] for line in utils.input_lines(input_file)
     )
     next_vals = []
     prev_vals = []
@@ -34,5 +34,18 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int, int]:
     return (sum(next_vals), sum(prev_vals))
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(max(1, round(200 * scale))):
+        coeffs = [rng.randint(-9, 9) for _ in range(rng.randint(2, 7))]
+        start = rng.randint(-5, 5)
+        values = (
+            sum(coeff * x**power for power, coeff in enumerate(coeffs))
+            for x in range(start, start + 21)
+        )
+        lines.append(" ".join(str(value) for value in values))
+    return "\n".join(lines) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
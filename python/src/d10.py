@@ -6,8 +6,10 @@ from __future__ import annotations
 
 import dataclasses
 import enum
+import math
+import random
 from pathlib import Path
-from typing import Generator, NamedTuple
+from typing import Generator, NamedTuple, Sequence
 
 import utils
 
@@ -58,7 +60,7 @@ class Field:
     pipe_loop: set[Coord] = dataclasses.field(default_factory=set)
 
     @classmethod
-    def from_lines(cls, lines: list[str]) -> Field:
+    def from_lines(cls, lines: Sequence[str]) -> Field:
         field = cls()
         for line_num, line in enumerate(lines):
             for col_num, char in enumerate(line):
@@ -121,7 +123,7 @@ def get_loop(
         if start in connected_pipes.get(adjacent, {})
     )
     (pipe, to_dir), prev = start_adjcent, start
-    from_dir = Direction(*(-1 * v for v in to_dir.value))
+    from_dir = Direction(tuple(-1 * v for v in to_dir.value))
     pipe_loop = [(start, from_dir)]
     while pipe != start:  # Walk the loop
         pipe_loop.append((pipe, from_dir))
@@ -136,8 +138,13 @@ def get_loop(
     return pipe_loop
 
 
+@utils.parser
+def parse_field(input_file: Path) -> Field:
+    return Field.from_lines(utils.input_lines(input_file))
+
+
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
-    field = Field.from_lines(input_file.read_text().splitlines())
+    field = parse_field(input_file)
     assert field.start is not None
     pipe_loop_dirs = get_loop(field.start, field.connected_pipes)
     field.pipe_loop = set(pipe for pipe, _ in pipe_loop_dirs)
@@ -145,5 +152,73 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]
     return (len(field.pipe_loop) // 2, len(enclosed_ground))
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    # The loop is the outline of a random tree on a coarse grid. Each tree node
+    # is a 3x3 block of tiles and each edge a 3x1 strip joining two of them,
+    # with a gap between blocks so the outline can't touch itself.
+    num_blocks = max(3, round(35 * math.sqrt(scale)))
+    steps = ((0, 1), (0, -1), (1, 0), (-1, 0))
+    start = (num_blocks // 2, num_blocks // 2)
+    tree = {start}
+    frontier = [(start, step) for step in steps]
+    region = set()
+    while frontier and len(tree) < 0.4 * num_blocks**2:
+        (col, line), (d_col, d_line) = frontier.pop(rng.randrange(len(frontier)))
+        block = (col + d_col, line + d_line)
+        if block in tree or not all(0 <= val < num_blocks for val in block):
+            continue
+        tree.add(block)
+        frontier.extend((block, step) for step in steps)
+        for idx in range(3):
+            if d_col:
+                edge_col = 4 * min(col, block[0]) + 4
+                region.add((edge_col, 4 * line + 1 + idx))
+            else:
+                edge_line = 4 * min(line, block[1]) + 4
+                region.add((4 * col + 1 + idx, edge_line))
+    for col, line in tree:
+        region |= {
+            (4 * col + 1 + d_col, 4 * line + 1 + d_line)
+            for d_col in range(3)
+            for d_line in range(3)
+        }
+    loop = {
+        (col, line)
+        for col, line in region
+        if any(
+            (col + d_col, line + d_line) not in region
+            for d_col in (-1, 0, 1)
+            for d_line in (-1, 0, 1)
+        )
+    }
+
+    size = 4 * num_blocks + 1
+    tiles = [
+        rng.choices("|-LJ7F.", weights=(1, 1, 1, 1, 1, 1, 24), k=size)
+        for _ in range(size)
+    ]
+    step_chars = {
+        frozenset(((0, -1), (0, 1))): "|",
+        frozenset(((-1, 0), (1, 0))): "-",
+        frozenset(((0, -1), (1, 0))): "L",
+        frozenset(((0, -1), (-1, 0))): "J",
+        frozenset(((0, 1), (-1, 0))): "7",
+        frozenset(((0, 1), (1, 0))): "F",
+    }
+    for col, line in loop:
+        connected = frozenset(
+            (d_col, d_line)
+            for d_col, d_line in steps
+            if (col + d_col, line + d_line) in loop
+        )
+        tiles[line][col] = step_chars[connected]
+    start_col, start_line = rng.choice(sorted(loop))
+    tiles[start_line][start_col] = "S"
+    for d_col, d_line in steps:  # Only the loop can connect to the start
+        if (start_col + d_col, start_line + d_line) not in loop:
+            tiles[start_line + d_line][start_col + d_col] = "."
+    return "".join("".join(line) + "\n" for line in tiles)
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
@@ -4,6 +4,8 @@ Advent Of Code 2023 Day 11
 
 from __future__ import annotations
 
+import math
+import random
 from itertools import combinations
 from pathlib import Path
 from typing import NamedTuple
@@ -21,7 +23,7 @@ class Coord(NamedTuple):
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
     galaxies: list[Coord] = []
-    for line_num, line in enumerate(input_file.read_text().splitlines()):
+    for line_num, line in enumerate(utils.input_lines(input_file)):
         galaxies.extend(
             (
                 Coord(col_num, line_num)
@@ -44,5 +46,25 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]
     return (total_sep + empty_dim, total_sep + empty_multi * empty_dim)
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    size = max(5, round(140 * math.sqrt(scale)))
+    empty_lines = set(rng.sample(range(size), max(1, size // 20)))
+    empty_cols = set(rng.sample(range(size), max(1, size // 20)))
+    return "".join(
+        "".join(
+            (
+                "#"
+                if line not in empty_lines
+                and col not in empty_cols
+                and rng.random() < 0.025
+                else "."
+            )
+            for col in range(size)
+        )
+        + "\n"
+        for line in range(size)
+    )
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
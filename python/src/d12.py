@@ -4,7 +4,7 @@ Advent Of Code 2023 Day 12
 
 from __future__ import annotations
 
-from functools import cache
+import random
 from pathlib import Path
 from typing import NamedTuple, Sequence
 
@@ -58,10 +58,11 @@ def consume_groups(
     return -1, num_damaged_to_add, group_len_idx
 
 
-@cache
+@utils.memoize()
 def spring_line_variations(
     line: str, num_damaged_to_add: int, exp_dam_groups: Sequence[int]
 ) -> int:
+    utils.count("variation_calls")
     consume_res = consume_groups(line, num_damaged_to_add, exp_dam_groups)
     if consume_res:
         idx_at, num_damaged_to_add, groups_consumed = consume_res
@@ -113,17 +114,27 @@ class SpringLine(NamedTuple):
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
-    spring_rows = (
-        SpringLine.from_spring_groups(*line.split())
-        for line in input_file.read_text().splitlines()
-    )
-    spring_rows2 = (
-        SpringLine.from_p2_line(line) for line in input_file.read_text().splitlines()
-    )
-    return (
-        sum(spring_row.get_num_arrangements() for spring_row in spring_rows),
-        sum(spring_row.get_num_arrangements() for spring_row in spring_rows2),
-    )
+    lines = utils.input_lines(input_file)
+    spring_rows = (SpringLine.from_spring_groups(*line.split()) for line in lines)
+    spring_rows2 = (SpringLine.from_p2_line(line) for line in lines)
+    with utils.phase("p1"):
+        p1 = sum(spring_row.get_num_arrangements() for spring_row in spring_rows)
+    with utils.phase("p2"):
+        p2 = sum(spring_row.get_num_arrangements() for spring_row in spring_rows2)
+    return (p1, p2)
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    lines = []
+    for _ in range(max(1, round(1000 * scale))):
+        groups = [rng.randint(1, 4) for _ in range(rng.randint(1, 4))]
+        springs = "." * rng.randint(0, 2)
+        for group in groups:
+            springs += "#" * group + "." * rng.randint(1, 2)
+        # Hide about half of the springs
+        springs = "".join("?" if rng.random() < 0.5 else char for char in springs)
+        lines.append(f"{springs} {','.join(str(group) for group in groups)}")
+    return "\n".join(lines) + "\n"
 
 
 if __name__ == "__main__":
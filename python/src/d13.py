@@ -4,6 +4,7 @@ Advent Of Code 2023 Day 13
 
 from __future__ import annotations
 
+import random
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -19,7 +20,7 @@ class Pattern:
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
     patterns: list[Pattern] = []
     pattern = Pattern()
-    for line in input_file.read_text().splitlines():
+    for line in utils.input_lines(input_file):
         if line:
             pattern.rows.append(line)
         else:
@@ -61,5 +62,32 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]
     return (p1, p2)
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    patterns = []
+    for _ in range(max(1, round(100 * scale))):
+        height, width = rng.randint(5, 17), rng.randint(5, 17)
+        rows = [rng.choices("#.", k=width) for _ in range(height)]
+        # Reflect the columns then the rows, leaving some rows at the bottom
+        # outside of the row reflection to put the smudge in
+        col_mirror = rng.randint(1, width - 1)
+        for row in rows:
+            for idx in range(col_mirror, min(width, 2 * col_mirror)):
+                row[idx] = row[2 * col_mirror - 1 - idx]
+        row_mirror = rng.randint(1, (height - 1) // 2)
+        for idx in range(row_mirror, 2 * row_mirror):
+            rows[idx] = list(rows[2 * row_mirror - 1 - idx])
+        smudge_row = rng.randrange(2 * row_mirror, height)
+        smudge_col = rng.randrange(
+            max(0, 2 * col_mirror - width), min(width, 2 * col_mirror)
+        )
+        rows[smudge_row][smudge_col] = (
+            "#" if rows[smudge_row][smudge_col] == "." else "."
+        )
+        if rng.random() < 0.5:
+            rows = [list(col) for col in zip(*rows)]
+        patterns.append("\n".join("".join(row) for row in rows))
+    return "\n\n".join(patterns) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
@@ -5,6 +5,8 @@ Advent Of Code 2023 Day 14
 from __future__ import annotations
 
 import enum
+import math
+import random
 from pathlib import Path
 from typing import Iterable, NamedTuple
 
@@ -58,7 +60,7 @@ def tilt(
 
 def parse(input_file: Path) -> tuple[dict[str, set[Coord]], int]:
     rocks: dict[str, set[Coord]] = {"O": set(), "#": set()}
-    for line_idx, line in enumerate(input_file.read_text().splitlines()):
+    for line_idx, line in enumerate(utils.input_lines(input_file)):
         size = len(line)
         for col_idx, char in enumerate(line):
             if char in rocks:
@@ -67,26 +69,43 @@ def parse(input_file: Path) -> tuple[dict[str, set[Coord]], int]:
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
-    rocks, size = parse(input_file)
-    rounds_after_tilt = tilt(Direction.NORTH, size, rocks["O"], rocks["#"])
-
-    rounds = rocks["O"]
-    f_rounds = frozenset(rounds)
-    seen_configs: dict[frozenset[Coord], int] = {}
-    while (loop_rejoin := seen_configs.get(f_rounds, None)) is None:
-        seen_configs[f_rounds] = len(seen_configs)
-        for a_dir in Direction:
-            rounds = tilt(a_dir, size, rounds, rocks["#"])
-        f_rounds = frozenset(rounds)
+    with utils.phase("parse"):
+        rocks, size = parse(input_file)
+    with utils.phase("p1"):
+        rounds_after_tilt = tilt(Direction.NORTH, size, rocks["O"], rocks["#"])
 
-    loop_len = len(seen_configs) - loop_rejoin
-    part_loop = (p2_cycles - loop_rejoin) % loop_len
-    final_config = next(
-        rounds for rounds, idx in seen_configs.items() if idx == part_loop + loop_rejoin
-    )
+    with utils.phase("p2"):
+        rounds = rocks["O"]
+        f_rounds = frozenset(rounds)
+        seen_configs: dict[frozenset[Coord], int] = {}
+        while (loop_rejoin := seen_configs.get(f_rounds, None)) is None:
+            seen_configs[f_rounds] = len(seen_configs)
+            for a_dir in Direction:
+                rounds = tilt(a_dir, size, rounds, rocks["#"])
+            f_rounds = frozenset(rounds)
+
+        loop_len = len(seen_configs) - loop_rejoin
+        part_loop = (p2_cycles - loop_rejoin) % loop_len
+        final_config = next(
+            rounds
+            for rounds, idx in seen_configs.items()
+            if idx == part_loop + loop_rejoin
+        )
 
     return (get_north_load(rounds_after_tilt), get_north_load(final_config))
 
 
+def work_units(input_file: Path) -> tuple[int, str]:
+    return utils.grid_cells(input_file), "cells"
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    size = max(5, round(100 * math.sqrt(scale)))
+    return "".join(
+        "".join(rng.choices("O#.", weights=(20, 15, 65), k=size)) + "\n"
+        for _ in range(size)
+    )
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
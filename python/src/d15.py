@@ -4,6 +4,8 @@ Advent Of Code 2023 Day 15
 
 from __future__ import annotations
 
+import random
+import string
 from pathlib import Path
 from typing import NamedTuple
 
@@ -27,7 +29,7 @@ class Lens(NamedTuple):
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
-    steps = input_file.read_text().splitlines()[0].split(",")
+    steps = utils.input_lines(input_file)[0].split(",")
     hashes = (hash(step) for step in steps)
 
     box_to_labels: dict[int, dict[str, Lens]] = {}
@@ -61,5 +63,21 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]
     return (sum(hashes), sum(focussing_power))
 
 
+def work_units(input_file: Path) -> tuple[int, str]:
+    return len(utils.input_lines(input_file)[0].split(",")), "steps"
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    labels = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6)))
+        for _ in range(500)
+    ]
+    steps = (
+        f"{label}-" if rng.random() < 0.3 else f"{label}={rng.randint(1, 9)}"
+        for label in rng.choices(labels, k=max(1, round(4000 * scale)))
+    )
+    return ",".join(steps) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
@@ -5,6 +5,8 @@ Advent Of Code 2023 Day 16
 from __future__ import annotations
 
 import enum
+import math
+import random
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import NamedTuple
@@ -81,35 +83,53 @@ def light_beam(location: Coord, in_dir: Direction, mirror_grid: MirrorGrid) -> i
             new_loc = (location.in_direction(new_dir), new_dir)
             if new_loc not in seen:
                 to_check.add(new_loc)
+    utils.count("beam_states", len(seen))
     return len(energized)
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
     mirror_grid = MirrorGrid()
-    for line_idx, line in enumerate(input_file.read_text().splitlines()):
-        mirror_grid.size = len(line)
-        for col_idx, char in enumerate(line):
-            if char != ".":
-                mirror_grid.grid[Coord(col_idx, mirror_grid.size - 1 - line_idx)] = char
-
-    p1 = light_beam(Coord(0, mirror_grid.size - 1), Direction.EAST, mirror_grid)
-
-    poss = []
-    for x in range(mirror_grid.size):
-        poss.append(light_beam(Coord(0, x), Direction.EAST, mirror_grid))
-    for x in range(mirror_grid.size):
-        poss.append(light_beam(Coord(x, 0), Direction.NORTH, mirror_grid))
-    for x in range(mirror_grid.size):
-        poss.append(
-            light_beam(Coord(mirror_grid.size - 1, x), Direction.WEST, mirror_grid)
-        )
-    for x in range(mirror_grid.size):
-        poss.append(
-            light_beam(Coord(x, mirror_grid.size - 1), Direction.SOUTH, mirror_grid)
-        )
+    with utils.phase("parse"):
+        for line_idx, line in enumerate(utils.input_lines(input_file)):
+            mirror_grid.size = len(line)
+            for col_idx, char in enumerate(line):
+                if char != ".":
+                    mirror_grid.grid[
+                        Coord(col_idx, mirror_grid.size - 1 - line_idx)
+                    ] = char
+
+    with utils.phase("p1"):
+        p1 = light_beam(Coord(0, mirror_grid.size - 1), Direction.EAST, mirror_grid)
+
+    with utils.phase("p2"):
+        poss = []
+        for x in range(mirror_grid.size):
+            poss.append(light_beam(Coord(0, x), Direction.EAST, mirror_grid))
+        for x in range(mirror_grid.size):
+            poss.append(light_beam(Coord(x, 0), Direction.NORTH, mirror_grid))
+        for x in range(mirror_grid.size):
+            poss.append(
+                light_beam(Coord(mirror_grid.size - 1, x), Direction.WEST, mirror_grid)
+            )
+        for x in range(mirror_grid.size):
+            poss.append(
+                light_beam(Coord(x, mirror_grid.size - 1), Direction.SOUTH, mirror_grid)
+            )
 
     return (p1, max(poss))
 
 
+def work_units(input_file: Path) -> tuple[int, str]:
+    return utils.grid_cells(input_file), "cells"
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    size = max(5, round(110 * math.sqrt(scale)))
+    return "".join(
+        "".join(rng.choices(".|-/\\", weights=(90, 3, 3, 2, 2), k=size)) + "\n"
+        for _ in range(size)
+    )
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2, "")
@@ -6,6 +6,8 @@ from __future__ import annotations
 
 import enum
 import heapq
+import math
+import random
 from functools import total_ordering
 from pathlib import Path
 from typing import NamedTuple
@@ -75,8 +77,10 @@ def min_heat_loss(start: CityBlock, end: CityBlock, p2: bool) -> int:
     ]
     heapq.heapify(to_check)
     visited = set()
+    heap_pops = heap_pushes = 0
     while to_check:
         heat_loss, walk_state = heapq.heappop(to_check)
+        heap_pops += 1
         if walk_state in visited:
             continue
         visited.add(walk_state)
@@ -94,21 +98,97 @@ def min_heat_loss(start: CityBlock, end: CityBlock, p2: bool) -> int:
                     if walk_state in visited:
                         continue
                     heapq.heappush(to_check, (new_heat_loss, walk_state))
+                    heap_pushes += 1
+    utils.count("heap_pops", heap_pops)
+    utils.count("heap_pushes", heap_pushes)
+    utils.gauge("visited", len(visited))
     return heat_loss
 
 
+def min_heat_loss_flat(heat_losses: list[int], width: int, p2: bool) -> int:
+    # A state is the block index times two plus the axis it was entered on,
+    # 0 moving across and 1 moving down or up, as both directions on an axis
+    # turn the same ways
+    num_blocks = len(heat_losses)
+    end = num_blocks - 1
+    min_straight, max_straight = (4, 10) if p2 else (1, 3)
+    to_check = [(0, 0), (0, 1)]
+    visited = bytearray(num_blocks * 2)
+    heat_loss = 0
+    heap_pops = heap_pushes = 0
+    while to_check:
+        heat_loss, state = heapq.heappop(to_check)
+        heap_pops += 1
+        if visited[state]:
+            continue
+        visited[state] = 1
+        index, axis = divmod(state, 2)
+        if index == end:
+            break
+        if axis:  # Turn to move across, staying on the same line
+            col = index % width
+            moves = [
+                (1, min(max_straight, width - 1 - col)),
+                (-1, min(max_straight, col)),
+            ]
+        else:
+            line = index // width
+            num_lines = num_blocks // width
+            moves = [
+                (width, min(max_straight, num_lines - 1 - line)),
+                (-width, min(max_straight, line)),
+            ]
+        for step, num_moves in moves:
+            new_heat_loss, new_index = heat_loss, index
+            for num_straight in range(1, num_moves + 1):
+                new_index += step
+                new_heat_loss += heat_losses[new_index]
+                if num_straight >= min_straight or new_index == end:
+                    new_state = new_index * 2 + 1 - axis
+                    if not visited[new_state]:
+                        heapq.heappush(to_check, (new_heat_loss, new_state))
+                        heap_pushes += 1
+    utils.count("heap_pops", heap_pops)
+    utils.count("heap_pushes", heap_pushes)
+    if utils.counters_enabled():  # Summing the states isn't free
+        utils.gauge("visited", sum(visited))
+    return heat_loss
+
+
+@utils.implementation("p1p2")
+def p1p2_flat(input_file: Path = utils.real_input()) -> tuple[int, ...]:
+    """p1p2 searching a flat list of heat losses rather than linked blocks."""
+    with utils.phase("parse"):
+        lines = utils.input_lines(input_file)
+        heat_losses = [int(char) for line in lines for char in line]
+    with utils.phase("p1"):
+        p1 = min_heat_loss_flat(heat_losses, len(lines[0]), False)
+    with utils.phase("p2"):
+        p2 = min_heat_loss_flat(heat_losses, len(lines[0]), True)
+    return (p1, p2)
+
+
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int, ...]:
-    grid = [
-        [int(char) for char in line] for line in input_file.read_text().splitlines()
-    ]
-    city_blocks = construct_city(grid)
-    return tuple(
-        min_heat_loss(
-            city_blocks[Coord(0, 0)],
-            city_blocks[Coord(len(grid[0]) - 1, len(grid[0]) - 1)],
-            is_p2,
-        )
-        for is_p2 in (False, True)
+    with utils.phase("parse"):
+        grid = [[int(char) for char in line] for line in utils.input_lines(input_file)]
+        city_blocks = construct_city(grid)
+    start = city_blocks[Coord(0, 0)]
+    end = city_blocks[Coord(len(grid[0]) - 1, len(grid[0]) - 1)]
+    with utils.phase("p1"):
+        p1 = min_heat_loss(start, end, False)
+    with utils.phase("p2"):
+        p2 = min_heat_loss(start, end, True)
+    return (p1, p2)
+
+
+def work_units(input_file: Path) -> tuple[int, str]:
+    return utils.grid_cells(input_file), "cells"
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    size = max(5, round(141 * math.sqrt(scale)))
+    return "".join(
+        "".join(rng.choices("123456789", k=size)) + "\n" for _ in range(size)
     )
 
 
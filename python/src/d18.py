@@ -5,6 +5,7 @@ Advent Of Code 2023 Day 18
 from __future__ import annotations
 
 import enum
+import random
 from itertools import pairwise
 from pathlib import Path
 from typing import NamedTuple
@@ -79,7 +80,7 @@ def get_verticies(insts: list[Instruction]) -> list[Coord]:
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
     instructions = [
-        Instruction.from_line(line) for line in input_file.read_text().splitlines()
+        Instruction.from_line(line) for line in utils.input_lines(input_file)
     ]
     p2_instructions = [inst.p2_inst() for inst in instructions]
     return (
@@ -90,5 +91,40 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]
     )
 
 
+def random_outline(
+    num_steps: int, max_dist: int, rng: random.Random
+) -> list[Instruction]:
+    # East along a top edge of steps above zero, then west along a bottom edge
+    # of steps below zero, so the outline never crosses itself
+    heights = [rng.randint(1, max_dist // 2)]
+    while len(heights) < 2 * num_steps:
+        if (height := rng.randint(1, max_dist // 2)) != heights[-1]:
+            heights.append(height)
+    levels = heights[:num_steps] + [-height for height in heights[num_steps:]]
+    widths = [rng.randint(1, max_dist) for _ in range(num_steps)]
+    widths += rng.sample(widths, num_steps)
+    outline = []
+    for idx, (level, width) in enumerate(zip(levels, widths)):
+        horizontal = Direction.EAST if idx < num_steps else Direction.WEST
+        outline.append(Instruction(horizontal, width, ""))
+        change = levels[(idx + 1) % len(levels)] - level
+        vertical = Direction.NORTH if change > 0 else Direction.SOUTH
+        outline.append(Instruction(vertical, abs(change), ""))
+    return outline
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    num_steps = max(1, round(175 * scale))
+    dir_to_inst = {direction: inst for inst, direction in INST_TO_DIR.items()}
+    dir_to_p2_inst = {direction: inst for inst, direction in P2_INST_TO_DIR.items()}
+    return "".join(
+        f"{dir_to_inst[p1.direction]} {p1.dist} "
+        f"(#{p2.dist:05x}{dir_to_p2_inst[p2.direction]})\n"
+        for p1, p2 in zip(
+            random_outline(num_steps, 10, rng), random_outline(num_steps, 0xFFFFF, rng)
+        )
+    )
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
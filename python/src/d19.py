@@ -6,6 +6,8 @@ from __future__ import annotations
 
 import math
 import operator
+import random
+import string
 from pathlib import Path
 from typing import Callable, NamedTuple
 
@@ -123,7 +125,7 @@ class Workflow(NamedTuple):
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
-    line_iter = iter(input_file.read_text().splitlines())
+    line_iter = utils.iter_input_lines(input_file)
     workflows: dict[str, Workflow] = {}
     for line in line_iter:
         if line:
@@ -144,5 +146,39 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]
     return (sum(v for part in accepted for v in part), sum(accepted_combs))
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    num_workflows = max(1, round(550 * scale))
+    max_name_len = 3 if num_workflows < 5000 else 4
+    names = {"in"}
+    while len(names) < num_workflows:
+        name_len = rng.randint(2, max_name_len)
+        names.add("".join(rng.choices(string.ascii_lowercase, k=name_len)))
+    unused = sorted(names - {"in"})
+    rng.shuffle(unused)
+
+    # Workflows form a tree from "in" so there are no loops
+    def result(to_expand: list[str]) -> str:
+        if unused and rng.random() < 0.7:
+            to_expand.append(unused.pop())
+            return to_expand[-1]
+        return rng.choice("AR")
+
+    lines, to_expand = [], ["in"]
+    while to_expand:
+        name = to_expand.pop(0)
+        rules = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:"
+            f"{result(to_expand)}"
+            for _ in range(rng.randint(1, 3))
+        ]
+        lines.append(f"{name}{{{','.join(rules + [result(to_expand)])}}}")
+    rng.shuffle(lines)
+    parts = (
+        "{" + ",".join(f"{var}={rng.randint(1, 4000)}" for var in "xmas") + "}"
+        for _ in range(max(1, round(200 * scale)))
+    )
+    return "\n".join(lines) + "\n\n" + "\n".join(parts) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
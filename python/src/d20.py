@@ -5,6 +5,8 @@ Advent Of Code 2023 Day 20
 from __future__ import annotations
 
 import math
+import random
+import string
 from collections import deque
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -91,17 +93,18 @@ def press_button(
         else:
             low_pulses += 1
             if pulse.to_module == "rx":
+                utils.count("pulses", low_pulses + high_pulses)
                 return None
         if dest_mod := modules.get(pulse.to_module):
             next_pulses = dest_mod.proc_pulse(pulse)
             pulses.extend(next_pulses)
+    utils.count("pulses", low_pulses + high_pulses)
     return low_pulses, high_pulses
 
 
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
     modules = {
-        (mod := mod_from_line(line)).name: mod
-        for line in input_file.read_text().splitlines()
+        (mod := mod_from_line(line)).name: mod for line in utils.input_lines(input_file)
     }
 
     outputs_to_rx = None
@@ -132,5 +135,47 @@ def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]
     return (math.prod(pulse_counts), math.lcm(*mod_periods.values()))
 
 
+def generate(scale: float, rng: random.Random) -> str:
+    # Like the real input, the broadcaster starts 12 bit counters of flip-flops
+    # that reset when they reach a prime. The conjunction of each counter feeds
+    # an inverter and they all feed the one to rx, so part 2 is the product
+    # of the primes.
+    primes = [
+        num
+        for num in range(2049, 4096, 2)
+        if all(num % div for div in range(3, math.isqrt(num) + 1, 2))
+    ]
+    used = {"rx"}
+
+    def new_name() -> str:
+        while True:
+            name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 3)))
+            if name not in used:
+                used.add(name)
+                return name
+
+    final = new_name()
+    lines = [f"&{final} -> rx"]
+    counter_starts = []
+    # The part 2 period detection needs at least two counters
+    for period in rng.sample(primes, max(2, min(len(primes), round(4 * scale)))):
+        flip_flops = [new_name() for _ in range(12)]
+        counter, inverter = new_name(), new_name()
+        counter_starts.append(flip_flops[0])
+        resets = [flip_flops[0]]
+        for bit, flip_flop in enumerate(flip_flops):
+            conns = flip_flops[bit + 1 : bit + 2]
+            if period >> bit & 1:
+                conns.append(counter)
+            else:
+                resets.append(flip_flop)
+            lines.append(f"%{flip_flop} -> {', '.join(conns)}")
+        lines.append(f"&{counter} -> {', '.join(resets + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+    lines.append(f"broadcaster -> {', '.join(counter_starts)}")
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2, "")
@@ -5,8 +5,10 @@ Advent Of Code 2023 Day 21
 from __future__ import annotations
 
 import enum
+import math
+import random
 from pathlib import Path
-from typing import Generator, NamedTuple
+from typing import Generator, NamedTuple, Sequence
 
 import utils
 
@@ -96,7 +98,7 @@ def get_reachable(gardens: set[Coord], start: Coord, num_steps: int) -> int:
     return len(reachable[num_steps % 2])
 
 
-def parse_garden(lines: list[str]) -> tuple[Coord, set[Coord], int]:
+def parse_garden(lines: Sequence[str]) -> tuple[Coord, set[Coord], int]:
     starts = []
 
     def start_char(col: int, line: int) -> Coord:
@@ -116,18 +118,44 @@ def p1p2(
     input_file: Path = utils.real_input(),
 ) -> tuple[int | None, tuple[int, ...] | None]:
     is_example = "example" in str(input_file)
-    start, gardens, size = parse_garden(input_file.read_text().splitlines())
-
-    max_reachable, steps_required = get_max_reachable(gardens, start)
-    if is_example:
-        p2s = tuple(
-            get_infini_reachable(gardens, start, (6, 10, 50), size)
-            # get_infini_reachable(gardens, start, (6, 10, 50, 100, 500, 1000, 5000), size)
-        )
-    else:
-        p2s = tuple(get_infini_reachable(gardens, start, (200,), size))
-        # p2s = tuple(get_infini_reachable(gardens, start, (26501365,), size))
-    return (get_reachable(gardens, start, 6 if is_example else 64), p2s)
+    with utils.phase("parse"):
+        start, gardens, size = parse_garden(utils.input_lines(input_file))
+
+    with utils.phase("max_reachable"):
+        max_reachable, steps_required = get_max_reachable(gardens, start)
+    with utils.phase("p2"):
+        if is_example:
+            p2s = tuple(
+                get_infini_reachable(gardens, start, (6, 10, 50), size)
+                # get_infini_reachable(gardens, start, (6, 10, 50, 100, 500, 1000, 5000), size)
+            )
+        else:
+            p2s = tuple(get_infini_reachable(gardens, start, (200,), size))
+            # p2s = tuple(get_infini_reachable(gardens, start, (26501365,), size))
+    with utils.phase("p1"):
+        p1 = get_reachable(gardens, start, 6 if is_example else 64)
+    return (p1, p2s)
+
+
+def work_units(input_file: Path) -> tuple[int, str]:
+    return utils.grid_cells(input_file), "cells"
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    # Odd sized with the start in the middle of a clear row and column and a
+    # clear border, like the real input
+    size = max(5, round(131 * math.sqrt(scale))) | 1
+    mid = size // 2
+    clear = {0, mid, size - 1}
+    lines = []
+    for line in range(size):
+        tiles = rng.choices("#.", weights=(15, 85), k=size)
+        for col in range(size):
+            if line in clear or col in clear:
+                tiles[col] = "."
+        lines.append("".join(tiles))
+    lines[mid] = lines[mid][:mid] + "S" + lines[mid][mid + 1 :]
+    return "\n".join(lines) + "\n"
 
 
 if __name__ == "__main__":
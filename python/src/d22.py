@@ -4,6 +4,7 @@ Advent Of Code 2023 Day 22
 
 from __future__ import annotations
 
+import random
 from pathlib import Path
 from typing import Generator, Iterable, NamedTuple
 
@@ -90,31 +91,66 @@ def get_what_rests_on(bricks: Iterable[Brick]) -> dict[Brick, set[Brick]]:
     return brick_to_bricks_below
 
 
+@utils.parser
+def parse_bricks(input_file: Path) -> list[Brick]:
+    return [Brick.from_line(line) for line in utils.input_lines(input_file)]
+
+
 def p1p2(input_file: Path = utils.real_input()) -> tuple[int | None, int | None]:
-    bricks = [Brick.from_line(line) for line in input_file.read_text().splitlines()]
-
-    brick_to_bricks_below = get_what_rests_on(bricks)
-    critical_bricks = {
-        next(iter(ontop_of))
-        for _, ontop_of in brick_to_bricks_below.items()
-        if len(ontop_of) == 1
-    }
-    disintegratable = set(bricks) - critical_bricks
-
-    brick_to_bricks_above: dict[Brick, set[Brick]] = {}
-    for brick, bricks_below in brick_to_bricks_below.items():
-        for brick_beneath in bricks_below:
-            brick_to_bricks_above.setdefault(brick_beneath, set()).add(brick)
-
-    brick_to_num_fall: dict[Brick, int] = {
-        brick: len(
-            what_falls_if_removed(brick, brick_to_bricks_above, brick_to_bricks_below)
-        )
-        for brick in bricks
-    }
+    with utils.phase("parse"):
+        bricks = parse_bricks(input_file)
+
+    with utils.phase("settle"):
+        brick_to_bricks_below = get_what_rests_on(bricks)
+    with utils.phase("p1"):
+        critical_bricks = {
+            next(iter(ontop_of))
+            for _, ontop_of in brick_to_bricks_below.items()
+            if len(ontop_of) == 1
+        }
+        disintegratable = set(bricks) - critical_bricks
+
+    with utils.phase("p2"):
+        brick_to_bricks_above: dict[Brick, set[Brick]] = {}
+        for brick, bricks_below in brick_to_bricks_below.items():
+            for brick_beneath in bricks_below:
+                brick_to_bricks_above.setdefault(brick_beneath, set()).add(brick)
+
+        brick_to_num_fall: dict[Brick, int] = {
+            brick: len(
+                what_falls_if_removed(
+                    brick, brick_to_bricks_above, brick_to_bricks_below
+                )
+            )
+            for brick in bricks
+        }
 
     return (len(disintegratable), sum(brick_to_num_fall.values()))
 
 
+def work_units(input_file: Path) -> tuple[int, str]:
+    return len(utils.input_lines(input_file)), "bricks"
+
+
+def generate(scale: float, rng: random.Random) -> str:
+    num_bricks = max(1, round(1200 * scale))
+    max_z = num_bricks // 4 + 10
+    filled: set[tuple[int, ...]] = set()
+    lines: list[str] = []
+    while len(lines) < num_bricks:
+        end_a = (rng.randint(0, 9), rng.randint(0, 9), rng.randint(1, max_z))
+        axis, length = rng.randrange(3), rng.randint(0, 4)
+        cubes = {
+            tuple(val + step * (idx == axis) for idx, val in enumerate(end_a))
+            for step in range(length + 1)
+        }
+        end_b = max(cubes)
+        if end_b[0] > 9 or end_b[1] > 9 or cubes & filled:
+            continue
+        filled |= cubes
+        lines.append(f"{','.join(map(str, end_a))}~{','.join(map(str, end_b))}")
+    return "\n".join(lines) + "\n"
+
+
 if __name__ == "__main__":
     utils.per_day_main(p1p2)
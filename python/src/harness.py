@@ -0,0 +1,2571 @@
+"""
+Tools for timing, profiling and serving the days, run with python -m utils.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import cProfile
+import fcntl
+import functools
+import gc
+import glob
+import hashlib
+import heapq
+import importlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import platform
+import pstats
+import random
+import resource
+import signal
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import timeit
+import tracemalloc
+import types
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    TypeVar,
+)
+
+from utils import (
+    GENERATED_DIR,
+    INPUT_DIR,
+    REPO_ROOT,
+    AnswerEntry,
+    CacheStats,
+    PhaseTime,
+    cache_stats,
+    clear_caches,
+    collect_counters,
+    collect_phases,
+    disable_counters,
+    disable_phases,
+    enable_counters,
+    enable_phases,
+    freeze_gc_after_parse,
+    get_all_days,
+    implementations,
+    load_manifest,
+    process_result,
+)
+
+HISTORY_FILE = REPO_ROOT / "bench_history.jsonl"
+TEST_DURATIONS_FILE = REPO_ROOT / ".test_durations.json"
+SOCKET_FILE = REPO_ROOT / "solver.sock"
+RESULT_CACHE_DIR = REPO_ROOT / ".result_cache"
+PARSE_CACHE_DIR = REPO_ROOT / ".parse_cache"
+PROFILE_DIR = REPO_ROOT / "profiles"
+
+T = TypeVar("T")
+
+
+def generated_input(day: str, scale: float = 1, seed: int = 0) -> Path:
+    """
+    Write an input for the day from its generate function into GENERATED_DIR.
+
+    Scale 1 is roughly the size of the real input and the same scale and seed
+    always give the same input.
+    """
+    day_mod = importlib.import_module(day)
+    input_file = GENERATED_DIR / f"{day}-x{scale:g}-s{seed}"
+    GENERATED_DIR.mkdir(parents=True, exist_ok=True)
+    input_file.write_text(day_mod.generate(scale, random.Random(seed)))
+    return input_file
+
+
+def _repo_sources(module: types.ModuleType) -> list[Path]:
+    """
+    The source files of the module and every module in the repo it imports,
+    directly or not, including those it imports names from.
+    """
+    src_dir = Path(__file__).resolve().parent
+    sources: set[Path] = set()
+    to_visit = [module]
+    while to_visit:
+        module = to_visit.pop()
+        module_file = getattr(module, "__file__", None)
+        if module_file is None:
+            continue
+        source = Path(module_file).resolve()
+        if source.parent != src_dir or source in sources:
+            continue
+        sources.add(source)
+        for value in vars(module).values():
+            if isinstance(value, types.ModuleType):
+                to_visit.append(value)
+            elif isinstance(from_name := getattr(value, "__module__", None), str):
+                if from_module := sys.modules.get(from_name):
+                    to_visit.append(from_module)
+    return sorted(sources)
+
+
+def _result_key(part_function: Callable[[Path], Any], input_file: Path) -> str:
+    key = hashlib.sha256()
+    for source in _repo_sources(sys.modules[part_function.__module__]):
+        key.update(source.read_bytes() + b"\0")
+    key.update(part_function.__qualname__.encode() + b"\0")
+    key.update(input_file.read_bytes())
+    return key.hexdigest()
+
+
+def _as_tuples(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_as_tuples(item) for item in value)
+    return value
+
+
+class BudgetExceeded(Exception):
+    """A solve went over its time or memory budget from answers.json."""
+
+    def __init__(self, reason: str, elapsed: float) -> None:
+        super().__init__(f"{reason} after {elapsed:.3f}s")
+        self.reason = reason
+        self.elapsed = elapsed
+
+
+def _budget_child(
+    conn: Any,
+    part_function: Callable[[Path], Any],
+    input_file: Path,
+    memory_budget: int | None,
+) -> None:
+    start = time.perf_counter()
+    hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+    outcome: tuple[str, Any, float]
+    try:
+        if memory_budget is not None:
+            # Allow the budget on top of what the process has mapped already
+            mapped = int(Path("/proc/self/statm").read_text().split()[0])
+            limit = mapped * resource.getpagesize() + memory_budget
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        result = part_function(input_file)
+    except MemoryError:
+        outcome = ("memory", None, time.perf_counter() - start)
+    except Exception as exc:  # Raised again in the parent
+        outcome = ("error", exc, time.perf_counter() - start)
+    else:
+        outcome = ("ok", result, time.perf_counter() - start)
+    if memory_budget is not None:
+        # Sending could run out of memory too when close to the budget
+        resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+    try:
+        conn.send(outcome)
+    except Exception as exc:  # The result or exception can't be pickled
+        status, _, elapsed = outcome
+        error = RuntimeError(
+            f"Can't send the {status} result back: {type(exc).__name__}: {exc}"
+        )
+        conn.send(("error", error, elapsed))
+
+
+def solve_within_budget(
+    part_function: Callable[[Path], Any],
+    input_file: Path,
+    time_budget: float | None = None,
+    memory_budget: int | None = None,
+) -> Any:
+    """
+    Call part_function on input_file, in a forked child limited to
+    memory_budget bytes more address space and killed after time_budget
+    seconds when either is given. Raises BudgetExceeded with the time taken
+    so far if the solve goes over.
+    """
+    if time_budget is None and memory_budget is None:
+        return part_function(input_file)
+    context = multiprocessing.get_context("fork")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    child = context.Process(
+        target=_budget_child,
+        args=(child_conn, part_function, input_file, memory_budget),
+        daemon=True,
+    )
+    start = time.perf_counter()
+    child.start()
+    child_conn.close()
+    try:
+        if not parent_conn.poll(time_budget):
+            raise BudgetExceeded(
+                f"over time budget of {time_budget:g}s", time.perf_counter() - start
+            )
+        try:
+            status, result, elapsed = parent_conn.recv()
+        except EOFError:
+            child.join()
+            raise BudgetExceeded(
+                f"killed with exit code {child.exitcode}", time.perf_counter() - start
+            ) from None
+    finally:
+        child.kill()
+        child.join()
+        parent_conn.close()
+    if status == "memory":
+        assert memory_budget is not None
+        raise BudgetExceeded(
+            f"over memory budget of {memory_budget / 2**20:g}MiB", elapsed
+        )
+    if status == "error":
+        raise result
+    return result
+
+
+def cached_solve(
+    part_function: Callable[[Path], Any],
+    input_file: Path,
+    use_cache: bool = True,
+    time_budget: float | None = None,
+    memory_budget: int | None = None,
+) -> tuple[Any, bool]:
+    """
+    Call part_function on input_file unless it has already been called with the
+    same source, of its module and the repo modules that imports, and input, in
+    which case the stored result is returned. Also returns whether the result
+    was cached. Setting AOC_RESULT_CACHE=0 in the environment always calls
+    part_function, e.g. to have the answer tests solve every day.
+    Solves are held to any budgets, see solve_within_budget.
+    """
+    if not use_cache or os.environ.get("AOC_RESULT_CACHE") == "0":
+        return (
+            solve_within_budget(part_function, input_file, time_budget, memory_budget),
+            False,
+        )
+    cache_file = RESULT_CACHE_DIR / _result_key(part_function, input_file)
+    if cache_file.exists():
+        return _as_tuples(json.loads(cache_file.read_text())), True
+    result = solve_within_budget(part_function, input_file, time_budget, memory_budget)
+    try:
+        result_text = json.dumps(result)
+    except TypeError:  # Only JSON results can be cached
+        return result, False
+    # Write then rename so parallel runs never see a partial file
+    RESULT_CACHE_DIR.mkdir(exist_ok=True)
+    temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}")
+    temp_file.write_text(result_text)
+    temp_file.replace(cache_file)
+    return result, False
+
+
+def cached_parse(parse_function: Callable[[Path], Any], input_file: Path) -> Any:
+    """
+    Load what parse_function returned for the same module, its source and
+    input, otherwise parse and store it, see utils.parser. The module name is
+    part of the key as the pickles refer to classes by it, e.g. __main__ when
+    a day is run as a script. Anything that can't be loaded is parsed again.
+    """
+    key = _result_key(parse_function, input_file)
+    cache_file = PARSE_CACHE_DIR / f"{parse_function.__module__}-{key}"
+    try:
+        return pickle.loads(cache_file.read_bytes())
+    except FileNotFoundError:
+        pass
+    except Exception:  # Stale or corrupt, e.g. a class that has been renamed
+        cache_file.unlink(missing_ok=True)
+    parsed = parse_function(input_file)
+    try:
+        parsed_bytes = pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, RecursionError, TypeError, AttributeError):
+        return parsed  # Not storable, e.g. too deeply linked
+    PARSE_CACHE_DIR.mkdir(exist_ok=True)
+    temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}")
+    temp_file.write_bytes(parsed_bytes)
+    temp_file.replace(cache_file)
+    return parsed
+
+
+def _format_phases(phase_times: Iterable[PhaseTime]) -> str:
+    return " | ".join(
+        f"{phase_time.name} {phase_time.avg_time:.9f}" for phase_time in phase_times
+    )
+
+
+def _format_counters(counters: Iterable[tuple[str, int]]) -> str:
+    return " | ".join(f"{name} {value:,}" for name, value in counters)
+
+
+def _write_trace(trace_file: Path, trace_events: list[dict[str, Any]]) -> None:
+    trace_file.write_text(json.dumps({"traceEvents": trace_events}))
+    print(f"Trace written to {trace_file}, view with chrome://tracing or Perfetto")
+
+
+class ResourceUsage(NamedTuple):
+    """getrusage deltas per solve, averaged when over several."""
+
+    user_time: float
+    sys_time: float
+    max_rss: int | None  # Peak since the solves started if it could be reset
+    minor_faults: float
+    major_faults: float
+    voluntary_switches: float
+    involuntary_switches: float
+
+    @classmethod
+    def between(
+        cls,
+        before: resource.struct_rusage,
+        after: resource.struct_rusage,
+        calls: int = 1,
+        max_rss: int | None = None,
+    ) -> ResourceUsage:
+        return cls(
+            (after.ru_utime - before.ru_utime) / calls,
+            (after.ru_stime - before.ru_stime) / calls,
+            max_rss,
+            (after.ru_minflt - before.ru_minflt) / calls,
+            (after.ru_majflt - before.ru_majflt) / calls,
+            (after.ru_nvcsw - before.ru_nvcsw) / calls,
+            (after.ru_nivcsw - before.ru_nivcsw) / calls,
+        )
+
+    def __str__(self) -> str:
+        max_rss = f" max RSS {self.max_rss / 2**20:.1f}MiB" if self.max_rss else ""
+        return (
+            f"user {self.user_time:.6f}s sys {self.sys_time:.6f}s{max_rss} "
+            f"faults {self.minor_faults:.0f} minor {self.major_faults:.0f} major "
+            f"switches {self.voluntary_switches:.0f} voluntary "
+            f"{self.involuntary_switches:.0f} involuntary"
+        )
+
+
+class Throughput(NamedTuple):
+    """
+    How fast a day gets through its input, to compare inputs of different
+    sizes. The units are the day's own measure of the work in an input, e.g.
+    grid cells, from its work_units function if it has one.
+    """
+
+    input_bytes: int
+    input_lines: int
+    units: int | None
+    unit_name: str
+    time: float  # Per solve
+
+    @classmethod
+    def measure(cls, day: str, input_file: Path, time: float) -> Throughput:
+        data = input_file.read_bytes()
+        units, unit_name = None, "units"
+        work_units = getattr(importlib.import_module(day), "work_units", None)
+        if work_units is not None:
+            units, unit_name = work_units(input_file)
+        return cls(len(data), len(data.splitlines()), units, unit_name, time)
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.input_bytes / 1e6 / self.time if self.time else math.inf
+
+    @property
+    def units_per_s(self) -> float | None:
+        if self.units is None:
+            return None
+        return self.units / self.time if self.time else math.inf
+
+    def rates(self) -> str:
+        units = (
+            ""
+            if self.units_per_s is None
+            else f" {self.units_per_s:,.0f} {self.unit_name}/s"
+        )
+        return f"{self.mb_per_s:.3f}MB/s{units}"
+
+    def __str__(self) -> str:
+        units = "" if self.units is None else f" {self.units:,} {self.unit_name}"
+        return (
+            f"{self.input_bytes / 1024:.1f}KiB {self.input_lines:,} lines{units}, "
+            f"{self.rates()}"
+        )
+
+
+class GCTuning(NamedTuple):
+    """
+    How the GC is set up while a day solves, parsed from a spec of options
+    joined with "+": default, disable, freeze and threshold=N[,N[,N]], e.g.
+    "freeze+threshold=50000". Freezing moves everything so far and what the
+    utils.parser functions return to the permanent generation.
+    """
+
+    disable: bool = False
+    freeze: bool = False
+    threshold: tuple[int, ...] = ()
+
+    @classmethod
+    def parse(cls, spec: str) -> GCTuning:
+        tuning = cls()
+        for option in spec.split("+"):
+            name, _, value = option.strip().partition("=")
+            if name == "default" and not value:
+                pass
+            elif name == "disable" and not value:
+                tuning = tuning._replace(disable=True)
+            elif name == "freeze" and not value:
+                tuning = tuning._replace(freeze=True)
+            elif name == "threshold" and value:
+                try:
+                    threshold = tuple(int(part) for part in value.split(","))
+                except ValueError:
+                    threshold = ()
+                if not 1 <= len(threshold) <= 3 or min(threshold) < 0:
+                    raise ValueError(f"Bad GC threshold {value!r}")
+                tuning = tuning._replace(threshold=threshold)
+            else:
+                raise ValueError(
+                    f"Unknown GC tuning {option!r}, expecting default, disable, "
+                    "freeze or threshold=N[,N[,N]]"
+                )
+        return tuning
+
+    def __str__(self) -> str:
+        options = [name for name in ("disable", "freeze") if getattr(self, name)]
+        if self.threshold:
+            options.append("threshold=" + ",".join(map(str, self.threshold)))
+        return "+".join(options) or "default"
+
+
+@contextlib.contextmanager
+def gc_tuning(tuning: GCTuning | None) -> Iterator[None]:
+    """Apply the GC tuning for the duration, then put the GC back as it was."""
+    if tuning is None:
+        yield
+        return
+    was_enabled = gc.isenabled()
+    threshold = gc.get_threshold()
+    if tuning.threshold:
+        gc.set_threshold(*tuning.threshold)
+    if tuning.freeze:
+        gc.freeze()
+        freeze_gc_after_parse()
+    if tuning.disable:
+        gc.disable()
+    try:
+        yield
+    finally:
+        if tuning.freeze:
+            freeze_gc_after_parse(False)
+            gc.unfreeze()
+        gc.set_threshold(*threshold)
+        if was_enabled:
+            gc.enable()
+
+
+def _gc_tuning_arg(spec: str) -> GCTuning:
+    try:
+        return GCTuning.parse(spec)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _entry_gc_tuning(
+    answer: AnswerEntry, override: GCTuning | None = None
+) -> GCTuning | None:
+    if override is not None:
+        return override
+    return None if answer.gc_tuning is None else GCTuning.parse(answer.gc_tuning)
+
+
+class GCStats(NamedTuple):
+    """Collections and the time paused for them per solve, averaged over several."""
+
+    collections: tuple[float, ...]  # By generation
+    pause_time: float
+    collected: float
+
+    def __str__(self) -> str:
+        collections = " ".join(
+            f"gen{generation} {count:.1f}"
+            for generation, count in enumerate(self.collections)
+        )
+        return (
+            f"{collections} collections, paused {self.pause_time:.6f}s, "
+            f"{self.collected:.0f} collected"
+        )
+
+
+class GCMonitor:
+    """Record the collections while in the context from gc.callbacks."""
+
+    def __init__(self) -> None:
+        self.collections = [0] * len(gc.get_count())
+        self.pause_time = 0.0
+        self.collected = 0
+        self._started = 0.0
+
+    def _callback(self, phase: str, info: dict[str, int]) -> None:
+        if phase == "start":
+            self._started = time.perf_counter()
+        else:
+            self.pause_time += time.perf_counter() - self._started
+            self.collections[info["generation"]] += 1
+            self.collected += info["collected"]
+
+    def __enter__(self) -> GCMonitor:
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        gc.callbacks.remove(self._callback)
+
+    def stats(self, calls: int = 1) -> GCStats:
+        return GCStats(
+            tuple(count / calls for count in self.collections),
+            self.pause_time / calls,
+            self.collected / calls,
+        )
+
+
+class MemoryStats(NamedTuple):
+    """Memory allocated by a single call of a day, from tracemalloc."""
+
+    peak_bytes: int
+    net_bytes: int
+    net_blocks: int
+    top_lines: tuple[str, ...]
+
+    def __str__(self) -> str:
+        return "\n".join(
+            [
+                (
+                    f"memory: peak {self.peak_bytes / 2**20:.2f}MiB "
+                    f"net {self.net_blocks} blocks ({self.net_bytes / 1024:+.1f}KiB)"
+                ),
+                *(f"    {line}" for line in self.top_lines),
+            ]
+        )
+
+
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def measure_memory(
+    func: Callable[..., T], *args: Any, top: int = 5
+) -> tuple[T, MemoryStats]:
+    """
+    Call func with tracemalloc tracing to get the peak memory and the net
+    blocks it left allocated. The top allocating lines are taken from a
+    snapshot as func first returns, while its locals are still alive, since
+    most of what a day allocates is freed by the time it has returned.
+    """
+    snapshots: list[tracemalloc.Snapshot] = []
+    tool_id = next(tool for tool in range(6) if sys.monitoring.get_tool(tool) is None)
+    code = getattr(func, "__code__", None) if top else None
+    if code is not None:
+
+        def _on_return(code: Any, offset: int, retval: object) -> None:
+            if not snapshots:
+                snapshots.append(tracemalloc.take_snapshot())
+
+        sys.monitoring.use_tool_id(tool_id, "utils.measure_memory")
+        sys.monitoring.register_callback(
+            tool_id, sys.monitoring.events.PY_RETURN, _on_return
+        )
+        sys.monitoring.set_local_events(tool_id, code, sys.monitoring.events.PY_RETURN)
+
+    was_tracing = tracemalloc.is_tracing()
+    gc.collect()
+    if not was_tracing:
+        tracemalloc.start(2)
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        result = func(*args)
+        peak_bytes = tracemalloc.get_traced_memory()[1] - start_bytes
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+        if code is not None:
+            sys.monitoring.set_local_events(tool_id, code, 0)
+            sys.monitoring.free_tool_id(tool_id)
+
+    before = before.filter_traces(_TRACE_FILTERS)
+    net = after.filter_traces(_TRACE_FILTERS).compare_to(before, "traceback")
+    at_return = (
+        snapshots[0].filter_traces(_TRACE_FILTERS).compare_to(before, "traceback")
+        if snapshots
+        else net
+    )
+    return result, MemoryStats(
+        peak_bytes,
+        sum(diff.size_diff for diff in net),
+        sum(diff.count_diff for diff in net),
+        _top_lines(at_return, top),
+    )
+
+
+def _top_lines(diffs: list[tracemalloc.StatisticDiff], top: int) -> tuple[str, ...]:
+    # NamedTuples are allocated in the <string> their class was exec'd from,
+    # so attribute those to the line that called them
+    by_line: dict[str, tuple[int, int]] = {}
+    for diff in diffs:
+        frame = next(
+            (
+                frame
+                for frame in reversed(diff.traceback)
+                if frame.filename != "<string>"
+            ),
+            diff.traceback[-1],
+        )
+        line = f"{Path(frame.filename).name}:{frame.lineno}"
+        size_diff, count_diff = by_line.get(line, (0, 0))
+        by_line[line] = (size_diff + diff.size_diff, count_diff + diff.count_diff)
+    return tuple(
+        f"{size_diff / 1024:+.1f}KiB {count_diff:+d} blocks {line}"
+        for line, (size_diff, count_diff) in sorted(
+            by_line.items(), key=lambda item: item[1][0], reverse=True
+        )[:top]
+    )
+
+
+PROFILE_MODES = ("cprofile", "sampling")
+
+
+class Profiler:
+    """
+    Profile calls either with cProfile or by sampling the stack on SIGPROF
+    timer signals. Sampling adds far less overhead to small hot functions, so
+    gives a more realistic split of the time. Only the profiled calls and what
+    they call are recorded.
+    """
+
+    def __init__(self, mode: str, interval: float = 0.001) -> None:
+        self.mode = mode
+        self.interval = interval
+        self.profile = cProfile.Profile() if mode == "cprofile" else None
+        self.stacks: Counter[str] = Counter()
+        self._root: Any = None
+
+    def call(self, func: Callable[..., T], *args: Any) -> T:
+        if self.profile is not None:
+            return self.profile.runcall(func, *args)
+        self._root = sys._getframe()
+        previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            return func(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+    def _sample(self, signum: int, frame: Any) -> None:
+        stack = []
+        while frame is not None and frame is not self._root:
+            code = frame.f_code
+            stack.append(
+                f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+        if frame is not None and stack:  # Skip samples from outside the call
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, name: str) -> Path:
+        """Write a pstats file or collapsed stacks for flame graph tools."""
+        PROFILE_DIR.mkdir(exist_ok=True)
+        if self.profile is not None:
+            profile_file = PROFILE_DIR / f"{name}.prof"
+            self.profile.dump_stats(profile_file)
+        else:
+            profile_file = PROFILE_DIR / f"{name}.folded"
+            profile_file.write_text(
+                "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+            )
+        return profile_file
+
+    def summary(self, top: int = 10) -> str:
+        if self.profile is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(self.profile, stream=stream)
+            stats.sort_stats("tottime").print_stats(top)
+            return stream.getvalue().strip()
+        # Time spent in each function itself, from the leaf of each sample
+        self_samples: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            self_samples[stack.rpartition(";")[2]] += count
+        total = sum(self_samples.values())
+        return "\n".join(
+            [f"{total} samples every {self.interval * 1000:g}ms"]
+            + [
+                f"{count / total:6.1%} {function}"
+                for function, count in self_samples.most_common(top)
+            ]
+        )
+
+
+def _batch_inputs(inputs: str) -> list[Path]:
+    """Every file in a directory or matching a glob, like input/generated/d17-*."""
+    if (input_dir := Path(inputs)).is_dir():
+        return sorted(path for path in input_dir.iterdir() if path.is_file())
+    return sorted(
+        path for path in map(Path, glob.glob(inputs, recursive=True)) if path.is_file()
+    )
+
+
+def _peak_rss() -> int | None:
+    """The peak resident set size since _reset_peak_rss, on Linux only."""
+    with contextlib.suppress(OSError):
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def _batch_solve(
+    part_function: Callable[[Path], Any],
+    input_file: Path,
+    cold_caches: bool,
+    measure_rss: bool = True,
+) -> dict[str, Any]:
+    if cold_caches:
+        clear_caches()
+    # The peak is for the whole process so is meaningless with other threads
+    can_reset = measure_rss and _reset_peak_rss()
+    record: dict[str, Any] = {"input": str(input_file)}
+    start = time.perf_counter()
+    try:
+        record["answer"] = part_function(input_file)
+    except Exception as exc:  # Keep going with the rest of the inputs
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    record["time"] = time.perf_counter() - start
+    record["peak_rss"] = _peak_rss() if can_reset else None
+    throughput = Throughput.measure(
+        part_function.__module__, input_file, record["time"]
+    )
+    record.update(
+        throughput._asdict(),
+        mb_per_s=throughput.mb_per_s,
+        units_per_s=throughput.units_per_s,
+    )
+    return record
+
+
+def _batch_solve_day(
+    day: str, function_name: str, cold_caches: bool, input_file: Path
+) -> dict[str, Any]:
+    """Solve in a pool worker, which imports the day the first time only."""
+    part_function = getattr(importlib.import_module(day), function_name)
+    return _batch_solve(part_function, input_file, cold_caches)
+
+
+def run_batch(
+    part_function: Callable[[Path], Any],
+    day: str,
+    input_files: list[Path],
+    cold_caches: bool = False,
+    jobs: int = 1,
+    threads: int = 1,
+) -> Iterator[dict[str, Any]]:
+    """
+    Solve each input in turn, or over a pool of jobs worker processes, yielding
+    a record of the answer, time, throughput and peak RSS (or error) for each
+    in order.
+
+    With more than one thread the inputs are solved by a pool of threads in
+    this process instead, sharing the imported day and its caches, which only
+    runs them in parallel on a free-threaded build. No peak RSS is recorded.
+    The threads can't be combined with jobs, or with cold caches as clearing
+    them would clear those of the other threads mid solve.
+    """
+    if threads > 1 and (jobs > 1 or cold_caches):
+        raise ValueError("Threads can't be used with jobs or cold caches")
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            yield from pool.map(
+                lambda input_file: _batch_solve(
+                    part_function, input_file, cold_caches, measure_rss=False
+                ),
+                input_files,
+            )
+        return
+    if jobs <= 1:
+        for input_file in input_files:
+            yield _batch_solve(part_function, input_file, cold_caches)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(
+            functools.partial(
+                _batch_solve_day, day, part_function.__name__, cold_caches
+            ),
+            input_files,
+            chunksize=max(1, len(input_files) // (jobs * 8)),
+        )
+
+
+def per_day_main(part_function: Any, day: str, input_file: str = "") -> int:
+    """Solve and check the answers of a day, returning the exit code."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--example", action="store_true", help="Example only")
+    parser.add_argument("--real", action="store_true", help="Real only")
+    parser.add_argument(
+        "--scale", type=float, help="Only a generated input of this scale"
+    )
+    parser.add_argument(
+        "--seed", default=0, type=int, help="Seed for the generated input"
+    )
+    parser.add_argument(
+        "--repeat", default=1, type=int, help="Number of times to run the test"
+    )
+    parser.add_argument(
+        "--cold-caches",
+        action="store_true",
+        help="Clear registered caches before every run",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always solve rather than use results cached for the same source and input",
+    )
+    parser.add_argument(
+        "--phases", action="store_true", help="Report the time of each phase"
+    )
+    parser.add_argument(
+        "--trace", type=Path, help="Write the phases to a Chrome trace JSON file"
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Report memory from tracemalloc for an extra run of each input",
+    )
+    parser.add_argument(
+        "--counters",
+        action="store_true",
+        help="Report the counters of work done that the day keeps",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help=f"Profile the solves, writing the profile to {PROFILE_DIR}",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help=f"Load what the day's parse function returned before from {PARSE_CACHE_DIR}",
+    )
+    parser.add_argument(
+        "--gc",
+        type=_gc_tuning_arg,
+        help="GC tuning for the solves rather than that in the answers, "
+        "e.g. disable, freeze or threshold=50000",
+    )
+    parser.add_argument(
+        "--inputs",
+        help="Solve every input in a directory or matching a glob instead, "
+        "writing a JSON line for each",
+    )
+    parser.add_argument(
+        "--jobs", default=1, type=int, help="Worker processes for --inputs"
+    )
+    parser.add_argument(
+        "--threads",
+        default=1,
+        type=int,
+        help="Worker threads for --inputs, sharing the day and its caches",
+    )
+    args = parser.parse_args()
+    if args.threads > 1 and (args.jobs > 1 or args.cold_caches):
+        # The threads share the caches, clearing them would affect the others
+        parser.error("--threads can't be used with --jobs or --cold-caches")
+    if args.parse_cache:
+        os.environ["AOC_PARSE_CACHE"] = "1"
+    if args.inputs:
+        for record in run_batch(
+            part_function,
+            day,
+            _batch_inputs(args.inputs),
+            args.cold_caches,
+            args.jobs,
+            args.threads,
+        ):
+            print(json.dumps(record, default=repr), flush=True)
+        return 0
+    if args.phases or args.trace:
+        enable_phases(trace=args.trace is not None)
+    if args.counters:
+        enable_counters()
+    all_trace_events = []
+
+    example_only = input_file == "example" or args.example
+    real_only = input_file == "real" or args.real
+    input_suffix = "" if input_file in ("example", "real") else input_file
+
+    manifest = load_manifest()
+    if input_suffix:
+        day_answers = [
+            *manifest.input_entries(day, True, input_suffix),
+            *manifest.input_entries(day, False, input_suffix),
+        ]
+    else:  # Examples first
+        day_answers = sorted(
+            manifest.day_entries(day), key=lambda entry: not entry.is_example
+        )
+    if args.scale is not None:
+        generated_file = generated_input(day, args.scale, args.seed)
+        day_answers = [
+            entry
+            for entry in get_all_days(False, needs_answer=False, generated=True)
+            if entry.input_file == generated_file
+        ]
+    # Only use cached results when not measuring the solve
+    use_cache = not (
+        args.no_cache
+        or args.repeat > 1
+        or args.cold_caches
+        or args.memory
+        or args.counters
+        or args.phases
+        or args.trace
+        or args.profile
+    )
+    to_check = []
+    overruns = 0
+    day_mod: Any = None
+    for answer in day_answers:
+        if answer.is_example and real_only or (not answer.is_example and example_only):
+            continue
+        if answer.function_name:
+            # If the function name is in the answer entry then use that
+            # rather than what was passed in
+            day_mod = importlib.__import__(day) if day_mod is None else day_mod
+            part_function = getattr(day_mod, answer.function_name)
+        profiler = Profiler(args.profile) if args.profile else None
+        clear_caches()
+        cached = False
+        budgeted = answer.time_budget is not None or answer.memory_budget is not None
+        if budgeted:
+            # Check the budgets once in a child, like _time_entry, then solve
+            # here so that what is measured is of this process
+            try:
+                result, cached = cached_solve(
+                    part_function,
+                    answer.input_file,
+                    use_cache,
+                    answer.time_budget,
+                    answer.memory_budget,
+                )
+            except BudgetExceeded as exc:
+                print(f"{answer.result_name()} FAILED {exc}")
+                overruns += 1
+                continue
+        can_reset_rss = _reset_peak_rss()
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+        tuning = _entry_gc_tuning(answer, args.gc)
+        start = time.perf_counter()
+        with GCMonitor() as gc_monitor, gc_tuning(tuning):
+            for _ in range(0 if cached else args.repeat):
+                if args.cold_caches:
+                    clear_caches()
+                if profiler:
+                    result = profiler.call(part_function, answer.input_file)
+                elif budgeted:
+                    result = part_function(answer.input_file)
+                else:
+                    result, cached = cached_solve(
+                        part_function, answer.input_file, use_cache
+                    )
+        duration = time.perf_counter() - start
+        cached_txt = ", cached" if cached else ""
+        print(
+            f"{answer.result_name()} = {result} (in {duration / args.repeat:.3f}s{cached_txt}) - expecting {answer.expected_result}"
+        )
+        if not cached:
+            usage_after = resource.getrusage(resource.RUSAGE_SELF)
+            max_rss = _peak_rss() if can_reset_rss else usage_after.ru_maxrss * 1024
+            usage = ResourceUsage.between(
+                usage_before, usage_after, args.repeat, max_rss
+            )
+            print(f"    rusage: {usage}")
+            throughput = Throughput.measure(
+                day, answer.input_file, duration / args.repeat
+            )
+            print(f"    throughput: {throughput}")
+            tuned = f" ({tuning})" if tuning else ""
+            print(f"    gc{tuned}: {gc_monitor.stats(args.repeat)}")
+        for stats in cache_stats(day):
+            print(f"    {stats}")
+        if counters := collect_counters():
+            runs = f" ({args.repeat} runs)" if args.repeat > 1 else ""
+            print(f"    counters{runs}: {_format_counters(counters.items())}")
+        phase_times, trace_events = collect_phases()
+        if phase_times:
+            print(f"    phases: {_format_phases(phase_times)}")
+        all_trace_events.extend(trace_events)
+        if args.memory:
+            # Tracing slows the phases down a lot so they are left out of it,
+            # and the counters too as they are only for the timed solves
+            disable_phases()
+            disable_counters()
+            clear_caches()
+            print(
+                textwrap.indent(
+                    str(measure_memory(part_function, answer.input_file)[1]),
+                    "    ",
+                )
+            )
+            if args.phases or args.trace:
+                enable_phases(trace=args.trace is not None)
+            if args.counters:
+                enable_counters()
+        if profiler:
+            profile_file = profiler.write(answer.result_name().rstrip())
+            print(f"    profile: {profile_file}")
+            print(textwrap.indent(profiler.summary(), "    "))
+        to_check.append((answer, result))
+    if args.trace:
+        _write_trace(args.trace, all_trace_events)
+    for answer, result in to_check:
+        process_result(answer, result)
+    return 1 if overruns else 0
+
+
+class RunConfig(NamedTuple):
+    """How each day is timed, passed to the worker processes with --jobs."""
+
+    repeats: int = 0  # Zero to use timeit autorange rather than the stats
+    warmup: int = 1
+    disable_gc: bool = False
+    cpu: int | None = None
+    cold_caches: bool = False
+    phases: bool = False
+    trace: bool = False
+    memory: bool = False
+    profile: str | None = None
+    counters: bool = False
+    gc: GCTuning | None = None  # Instead of the tuning in the answers
+
+
+class BenchStats(NamedTuple):
+    """Statistics from repeatedly running a day after a cold first call."""
+
+    cold_time: float
+    min_time: float
+    median_time: float
+    q1_time: float
+    q3_time: float
+    repeats: int
+
+    @classmethod
+    def from_samples(cls, cold_time: float, samples: list[float]) -> BenchStats:
+        if len(samples) > 1:
+            q1_time, median_time, q3_time = statistics.quantiles(samples, n=4)
+        else:
+            q1_time = median_time = q3_time = samples[0]
+        return cls(cold_time, min(samples), median_time, q1_time, q3_time, len(samples))
+
+    @property
+    def iqr(self) -> float:
+        return self.q3_time - self.q1_time
+
+
+def benchmark(func: Callable[[], Any], config: RunConfig) -> BenchStats:
+    """
+    Time the cold first call of func on its own, then after the warmup calls
+    time each of the repeats to get the steady state statistics.
+    """
+    start = time.perf_counter()
+    func()
+    cold_time = time.perf_counter() - start
+    for _ in range(config.warmup):
+        func()
+
+    gc_was_enabled = gc.isenabled()
+    if config.disable_gc:
+        gc.collect()
+        gc.disable()
+    samples = []
+    try:
+        for _ in range(config.repeats):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return BenchStats.from_samples(cold_time, samples)
+
+
+class DayTiming(NamedTuple):
+    """Timing info from running a days answer repeatedly."""
+
+    answer: AnswerEntry
+    avg_time: float
+    num_calls: int
+    total_time: float
+    stats: BenchStats | None = None
+    caches: tuple[CacheStats, ...] = ()
+    phases: tuple[PhaseTime, ...] = ()
+    trace_events: tuple[dict[str, Any], ...] = ()
+    memory: MemoryStats | None = None
+    profile_file: Path | None = None
+    profile_summary: str = ""
+    counters: tuple[tuple[str, int], ...] = ()
+    rusage: ResourceUsage | None = None
+    gc: GCStats | None = None
+    gc_tuning: GCTuning | None = None
+    throughput: Throughput | None = None
+    failure: str = ""  # Why the day went over its budget, with partial timing
+
+
+class HistoryRecord(NamedTuple):
+    """A single timing of a day stored in the benchmark history."""
+
+    day: str
+    function_name: str
+    input_name: str
+    input_hash: str
+    revision: str
+    timestamp: float
+    avg_time: float
+    num_calls: int
+    median_time: float | None = None
+    cold_time: float | None = None
+    # ResourceUsage per solve
+    user_time: float | None = None
+    sys_time: float | None = None
+    max_rss: int | None = None
+    minor_faults: float | None = None
+    major_faults: float | None = None
+    voluntary_switches: float | None = None
+    involuntary_switches: float | None = None
+    gc_pause_time: float | None = None  # Per solve
+    gc_tuning: str | None = None
+    input_bytes: int | None = None
+    input_lines: int | None = None
+    units: int | None = None
+    unit_name: str | None = None
+    run_config: str = ""  # From _run_config_label
+    machine: str = ""
+    python: str = ""
+
+    def key(self) -> tuple[str, str, str, str, str, str, str]:
+        """Only timings with the same key, taken the same way, are compared."""
+        return (
+            self.day,
+            self.function_name,
+            self.input_name,
+            self.run_config,
+            self.gc_tuning or "",
+            self.machine,
+            self.python,
+        )
+
+    def steady_time(self) -> float:
+        return self.avg_time if self.median_time is None else self.median_time
+
+    def time_per_unit(self) -> float | None:
+        """Seconds per unit of work, or per byte for days without units."""
+        size = self.units if self.units is not None else self.input_bytes
+        return self.steady_time() / size if size else None
+
+    def unit_label(self) -> str:
+        return "bytes" if self.units is None else str(self.unit_name)
+
+
+def _git_revision() -> str:
+    def _git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        revision = _git("rev-parse", "--short", "HEAD")
+        dirty = _git("status", "--porcelain", "--untracked-files=no")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return revision + ("-dirty" if dirty else "")
+
+
+def _input_hash(input_file: Path) -> str:
+    return hashlib.sha256(input_file.read_bytes()).hexdigest()[:16]
+
+
+def load_history() -> list[HistoryRecord]:
+    """
+    The records in HISTORY_FILE, skipping lines that were cut short or aren't
+    a record, e.g. from an interrupted run.
+    """
+    if not HISTORY_FILE.exists():
+        return []
+    records = []
+    skipped = 0
+    for line in HISTORY_FILE.read_text().splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = HistoryRecord(**json.loads(line))
+        except (ValueError, TypeError):
+            skipped += 1
+            continue
+        if not all(
+            isinstance(value, (int, float))
+            for value in (record.timestamp, record.avg_time, record.num_calls)
+        ):
+            skipped += 1
+            continue
+        records.append(record)
+    if skipped:
+        print(f"Skipped {skipped} malformed lines in {HISTORY_FILE}", file=sys.stderr)
+    return records
+
+
+def _python_version() -> str:
+    build = "" if _gil_enabled() else "t"
+    return f"{platform.python_implementation()} {platform.python_version()}{build}"
+
+
+def _run_config_label(config: RunConfig, jobs: int = 1) -> str:
+    """The options of a run that change the timings, e.g. "repeats=5 warmup=1"."""
+    options = (
+        [f"repeats={config.repeats}", f"warmup={config.warmup}"]
+        if config.repeats
+        else ["autorange"]
+    )
+    if config.disable_gc:
+        options.append("no-gc")
+    if config.cpu is not None:
+        options.append(f"cpu={config.cpu}")
+    if config.cold_caches:
+        options.append("cold-caches")
+    if config.phases or config.trace:
+        options.append("phases")
+    if os.environ.get("AOC_PARSE_CACHE") == "1":
+        options.append("parse-cache")
+    if jobs > 1:
+        options.append(f"jobs={jobs}")
+    return " ".join(options)
+
+
+def _append_history(timing_data: list[DayTiming], run_config: str) -> None:
+    revision = _git_revision()
+    timestamp = time.time()
+    machine = f"{platform.node()} {platform.machine()}"
+    python = _python_version()
+    with HISTORY_FILE.open("a") as history:
+        for timing in timing_data:
+            answer = timing.answer
+            assert answer.function_name is not None
+            record = HistoryRecord(
+                answer.module_name,
+                answer.function_name,
+                str(answer.input_file.relative_to(INPUT_DIR)),
+                _input_hash(answer.input_file),
+                revision,
+                timestamp,
+                timing.avg_time,
+                timing.num_calls,
+                timing.stats.median_time if timing.stats else None,
+                timing.stats.cold_time if timing.stats else None,
+                **(timing.rusage._asdict() if timing.rusage else {}),
+                gc_pause_time=timing.gc.pause_time if timing.gc else None,
+                gc_tuning=None if timing.gc_tuning is None else str(timing.gc_tuning),
+                input_bytes=(
+                    timing.throughput.input_bytes if timing.throughput else None
+                ),
+                input_lines=(
+                    timing.throughput.input_lines if timing.throughput else None
+                ),
+                units=timing.throughput.units if timing.throughput else None,
+                unit_name=timing.throughput.unit_name if timing.throughput else None,
+                run_config=run_config,
+                machine=machine,
+                python=python,
+            )
+            history.write(json.dumps(record._asdict()) + "\n")
+
+
+def _past_timing_key(answer: AnswerEntry) -> tuple[str, str, str]:
+    assert answer.function_name is not None
+    return (
+        answer.module_name,
+        answer.function_name,
+        str(answer.input_file.relative_to(INPUT_DIR)),
+    )
+
+
+def _load_past_timings() -> dict[tuple[str, str, str], float]:
+    """Most recent time of each day, function and input for scheduling."""
+    return {
+        (record.day, record.function_name, record.input_name): record.steady_time()
+        for record in load_history()
+    }
+
+
+def _time_entry(config: RunConfig, answer: AnswerEntry) -> DayTiming:
+    """Time a single answer entry, this is run in worker processes with --jobs."""
+    assert answer.function_name is not None
+    day_mod = importlib.__import__(answer.module_name)
+    part_function = getattr(day_mod, answer.function_name)
+    if config.cpu is not None:
+        os.sched_setaffinity(0, {config.cpu})
+
+    tuning = _entry_gc_tuning(answer, config.gc)
+    solve_calls = 0
+
+    def _solve() -> Any:
+        nonlocal solve_calls
+        solve_calls += 1
+        if config.cold_caches:
+            clear_caches()
+        with gc_tuning(tuning):
+            return part_function(answer.input_file)
+
+    if answer.time_budget is not None or answer.memory_budget is not None:
+        # Check the budgets once in a child, the timed calls can't be limited
+        try:
+            solve_within_budget(
+                part_function,
+                answer.input_file,
+                answer.time_budget,
+                answer.memory_budget,
+            )
+        except BudgetExceeded as exc:
+            return DayTiming(answer, exc.elapsed, 1, exc.elapsed, failure=str(exc))
+
+    # Don't let caches warmed by another day or input carry over to this one
+    clear_caches()
+    stats = None
+    # Only for the timed calls, and off again for the next entry in the process
+    if config.phases or config.trace:
+        enable_phases(config.trace)
+    try:
+        # Only this day runs in the process meanwhile so it is all down to the day
+        can_reset_rss = _reset_peak_rss()
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+        with GCMonitor() as gc_monitor:
+            if not config.repeats:
+                num_calls, time_taken = timeit.Timer(_solve).autorange()
+                avg_time = time_taken / num_calls
+            else:
+                stats = benchmark(_solve, config)
+                # Only the steady state calls count towards the average
+                avg_time, num_calls = stats.median_time, stats.repeats
+                time_taken = stats.median_time * stats.repeats
+        rusage = ResourceUsage.between(
+            usage_before,
+            resource.getrusage(resource.RUSAGE_SELF),
+            solve_calls,
+            _peak_rss() if can_reset_rss else None,
+        )
+        phase_times, trace_events = collect_phases()
+    finally:
+        disable_phases()
+    caches = tuple(cache_stats(answer.module_name))
+    throughput = Throughput.measure(answer.module_name, answer.input_file, avg_time)
+    memory = None
+    if config.memory:
+        # Measured on its own call as tracing slows the day down a lot
+        clear_caches()
+        memory = measure_memory(part_function, answer.input_file)[1]
+    profile_file, profile_summary = None, ""
+    if config.profile:
+        # Also on its own call to keep the profiler overhead out of the timing
+        clear_caches()
+        profiler = Profiler(config.profile)
+        profiler.call(part_function, answer.input_file)
+        profile_file = profiler.write(
+            f"{answer.result_name().rstrip()}-{answer.function_name}"
+        )
+        profile_summary = profiler.summary(5)
+    counters: tuple[tuple[str, int], ...] = ()
+    if config.counters:
+        # Counted for a single cold call so they don't depend on the repeats
+        clear_caches()
+        enable_counters()
+        try:
+            part_function(answer.input_file)
+            counters = tuple(collect_counters().items())
+        finally:
+            disable_counters()
+    return DayTiming(
+        answer,
+        avg_time,
+        num_calls,
+        time_taken,
+        stats,
+        caches,
+        tuple(phase_times),
+        tuple(trace_events),
+        memory,
+        profile_file,
+        profile_summary,
+        counters,
+        rusage,
+        gc_monitor.stats(solve_calls),
+        tuning,
+        throughput,
+    )
+
+
+def _time_entry_shared(config: RunConfig, answer: AnswerEntry) -> DayTiming:
+    """
+    Time a single answer entry in a worker thread. The threads share the days,
+    their caches and inputs so this leaves process wide state alone, it
+    doesn't clear caches, collect instrumentation, tune the GC or fork to
+    check budgets.
+    """
+    assert answer.function_name is not None
+    part_function = getattr(sys.modules[answer.module_name], answer.function_name)
+    solve_calls = 0
+
+    def _solve() -> Any:
+        nonlocal solve_calls
+        solve_calls += 1
+        return part_function(answer.input_file)
+
+    # Usage of just this thread where supported, the peak RSS is process wide
+    who = getattr(resource, "RUSAGE_THREAD", None)
+    usage_before = resource.getrusage(who) if who is not None else None
+    stats = None
+    if not config.repeats:
+        num_calls, time_taken = timeit.Timer(_solve).autorange()
+        avg_time = time_taken / num_calls
+    else:
+        stats = benchmark(_solve, config)
+        avg_time, num_calls = stats.median_time, stats.repeats
+        time_taken = stats.median_time * stats.repeats
+    rusage = None
+    if who is not None and usage_before is not None:
+        rusage = ResourceUsage.between(
+            usage_before, resource.getrusage(who), solve_calls
+        )
+    throughput = Throughput.measure(answer.module_name, answer.input_file, avg_time)
+    return DayTiming(
+        answer,
+        avg_time,
+        num_calls,
+        time_taken,
+        stats,
+        rusage=rusage,
+        throughput=throughput,
+    )
+
+
+def _gil_enabled() -> bool:
+    is_gil_enabled: Callable[[], bool] = getattr(sys, "_is_gil_enabled", lambda: True)
+    return is_gil_enabled()
+
+
+def _run_all(
+    days: list[str],
+    jobs: int = 1,
+    examples: bool = False,
+    config: RunConfig = RunConfig(),
+    trace_file: Path | None = None,
+    generated: bool = False,
+    threads: int = 1,
+) -> int:
+    """
+    Get data from running each day on its own then all days in one go.
+
+    With more than one job each day is timed in a new worker process of its
+    own, longest first based on previous timings, and the all days time is the
+    wall time.
+    More than one thread does the same with threads sharing one copy of the
+    days, which only run in parallel on a free-threaded build, so those
+    timings aren't added to the history.
+    Returns the number of days that went over their budgets, these are left
+    out of the history and the all days time.
+    """
+    answers = [
+        answer
+        for answer in get_all_days(examples, True, generated)
+        if not days or answer.module_name in days
+    ]
+    if jobs > 1 or threads > 1:
+        # Unknown timings go first since they could be the slowest
+        past_timings = _load_past_timings()
+        answers.sort(
+            key=lambda answer: past_timings.get(_past_timing_key(answer), float("inf")),
+            reverse=True,
+        )
+    if threads > 1:
+        # Import up front rather than in the threads, then start from cold
+        for answer in answers:
+            importlib.import_module(answer.module_name)
+        clear_caches()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            timing_data = list(
+                pool.map(functools.partial(_time_entry_shared, config), answers)
+            )
+        all_days = time.perf_counter() - start
+    elif jobs > 1:
+        start = time.perf_counter()
+        # A fresh worker for each entry so no state of one day leaks into the
+        # next, which needs workers that aren't forked from this process
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("forkserver"),
+            max_tasks_per_child=1,
+        ) as pool:
+            timing_data = list(
+                pool.map(functools.partial(_time_entry, config), answers)
+            )
+        all_days = time.perf_counter() - start
+    else:
+        timing_data = [_time_entry(config, answer) for answer in answers]
+        test_calls = []
+        for timing in timing_data:
+            if timing.failure:
+                continue
+            answer = timing.answer
+            assert answer.function_name is not None
+            day_mod = importlib.__import__(answer.module_name)
+            test_calls.append(
+                (getattr(day_mod, answer.function_name), answer.input_file)
+            )
+
+        # Now run all days together
+        all_days = timeit.timeit(
+            lambda: [day(input) for day, input in test_calls], number=1
+        )
+    failures = [timing for timing in timing_data if timing.failure]
+    timing_data = [timing for timing in timing_data if not timing.failure]
+    if threads <= 1:
+        _append_history(timing_data, _run_config_label(config, jobs))
+
+    for timing in failures:
+        print(
+            f"{timing.answer.module_name} {timing.answer.result_name().rstrip()} "
+            f"FAILED {timing.failure} (partial time {timing.avg_time:.9f})"
+        )
+    for timing in sorted(timing_data, key=lambda timing: timing.avg_time, reverse=True):
+        answer = timing.answer
+        # Real inputs are one per day, the others need the input to tell apart
+        name = (
+            answer.result_name().rstrip()
+            if answer.is_example or answer.is_generated
+            else answer.module_name
+        )
+        if stats := timing.stats:
+            print(
+                f"{name} median {stats.median_time:.9f} min {stats.min_time:.9f} "
+                f"IQR {stats.iqr:.9f} ({stats.repeats} repeats) cold {stats.cold_time:.9f}"
+            )
+        else:
+            print(
+                f"{name} avg {timing.avg_time:.9f} ({timing.num_calls} calls in {timing.total_time:.9f})"
+            )
+        if timing.rusage:
+            print(f"    rusage: {timing.rusage}")
+        if timing.throughput:
+            print(f"    throughput: {timing.throughput}")
+        if timing.gc:
+            tuned = f" ({timing.gc_tuning})" if timing.gc_tuning else ""
+            print(f"    gc{tuned}: {timing.gc}")
+        for cache in timing.caches:
+            print(f"    {cache}")
+        if timing.phases:
+            print(f"    phases: {_format_phases(timing.phases)}")
+        if timing.counters:
+            print(f"    counters: {_format_counters(timing.counters)}")
+        if timing.memory:
+            print(textwrap.indent(str(timing.memory), "    "))
+        if timing.profile_file:
+            print(f"    profile: {timing.profile_file}")
+            print(textwrap.indent(timing.profile_summary, "    "))
+
+    if trace_file:
+        _write_trace(
+            trace_file,
+            [event for timing in timing_data for event in timing.trace_events],
+        )
+
+    if jobs > 1 or threads > 1:
+        summed = sum(timing.avg_time for timing in timing_data)
+        if threads > 1:
+            gil = "GIL enabled" if _gil_enabled() else "free-threaded"
+            workers = f"{threads} threads, {gil}"
+        else:
+            workers = f"{jobs} jobs"
+        print(
+            f"All {len(timing_data)} days take {summed:.9f} summed ({workers}, {all_days:.9f} wall time)"
+        )
+    else:
+        print(
+            f"All {len(timing_data)} days take {all_days:.9f} on average (1 calls in {all_days:.9f})"
+        )
+    return len(failures)
+
+
+def compare_implementations(
+    days: list[str],
+    config: RunConfig,
+    examples: bool = False,
+    generated: bool = False,
+) -> int:
+    """
+    Check that every implementation registered for a days function gives the
+    same result as it on each input, then benchmark them side by side with the
+    same statistics. Returns the number of inputs they disagree on.
+    """
+    disagreements = 0
+    for answer in get_all_days(examples, True, generated):
+        if days and answer.module_name not in days:
+            continue
+        assert answer.function_name is not None
+        importlib.import_module(answer.module_name)
+        part_functions = implementations(answer.module_name, answer.function_name)
+        if len(part_functions) < 2:
+            continue
+        print(f"{answer.module_name} {answer.result_name().rstrip()}")
+        results = []
+        for part_function in part_functions:
+            clear_caches()
+            results.append(part_function(answer.input_file))
+        if any(result != results[0] for result in results[1:]):
+            for part_function, result in zip(part_functions, results):
+                print(f"    {part_function.__name__} = {result}")
+            print("    DISAGREE")
+            disagreements += 1
+            continue
+
+        base_time = None
+        for part_function in part_functions:
+
+            def _solve(
+                part_function: Callable[[Path], Any] = part_function,
+                input_file: Path = answer.input_file,
+            ) -> Any:
+                if config.cold_caches:
+                    clear_caches()
+                return part_function(input_file)
+
+            clear_caches()
+            stats = benchmark(_solve, config)
+            base_time = base_time or stats.median_time
+            print(
+                f"    {part_function.__name__:<20} median {stats.median_time:.9f} "
+                f"min {stats.min_time:.9f} IQR {stats.iqr:.9f} cold {stats.cold_time:.9f}"
+                f" ({base_time / stats.median_time:.2f}x)"
+            )
+    return disagreements
+
+
+def compare_gc_tunings(
+    days: list[str],
+    tunings: list[GCTuning],
+    config: RunConfig,
+    examples: bool = False,
+    generated: bool = False,
+) -> None:
+    """
+    Benchmark each day with each GC tuning side by side, by default with none,
+    that declared in the answers, disabled and frozen, reporting the
+    collections and pauses along with the speed up on the first tuning.
+    """
+    for answer in get_all_days(examples, True, generated):
+        if days and answer.module_name not in days:
+            continue
+        assert answer.function_name is not None
+        part_function = getattr(
+            importlib.import_module(answer.module_name), answer.function_name
+        )
+        declared = _entry_gc_tuning(answer)
+        day_tunings = tunings or [
+            GCTuning(),
+            *([declared] if declared else []),
+            GCTuning(disable=True),
+            GCTuning(freeze=True),
+        ]
+        print(f"{answer.module_name} {answer.result_name().rstrip()}")
+        base_time = None
+        for tuning in dict.fromkeys(day_tunings):
+            solve_calls = 0
+
+            def _solve(
+                part_function: Callable[[Path], Any] = part_function,
+                tuning: GCTuning = tuning,
+                input_file: Path = answer.input_file,
+            ) -> Any:
+                nonlocal solve_calls
+                solve_calls += 1
+                if config.cold_caches:
+                    clear_caches()
+                with gc_tuning(tuning):
+                    return part_function(input_file)
+
+            clear_caches()
+            with GCMonitor() as gc_monitor:
+                stats = benchmark(_solve, config)
+            base_time = base_time or stats.median_time
+            name = f"{tuning} *" if tuning == declared else str(tuning)
+            print(
+                f"    {name:<24} median {stats.median_time:.9f} "
+                f"min {stats.min_time:.9f} IQR {stats.iqr:.9f} cold {stats.cold_time:.9f}"
+                f" ({base_time / stats.median_time:.2f}x)"
+            )
+            print(f"        {gc_monitor.stats(solve_calls)}")
+
+
+def _compared_times(records: list[HistoryRecord], per_unit: bool) -> list[float]:
+    if not per_unit:
+        return [record.steady_time() for record in records]
+    return [
+        time_per_unit
+        for record in records
+        if (time_per_unit := record.time_per_unit()) is not None
+    ]
+
+
+def compare_history(
+    threshold: float, baseline: str | None = None, current: str | None = None
+) -> int:
+    """
+    Compare the median time of each day at the current revision against the
+    baseline revision, returning the number of days that have regressed.
+
+    By default the current revision is the one most recently recorded and the
+    baseline is the revision recorded before that for the same day and input.
+    Only timings taken the same way, on the same machine and Python with the
+    same run options and GC tuning, are compared with each other. Where the sizes of the inputs were recorded the time per unit of work is
+    compared, so an input that has grown doesn't look like a regression,
+    otherwise only times of the same input are.
+    """
+    history = load_history()
+    if not history:
+        print(f"No benchmark history in {HISTORY_FILE}")
+        return 0
+    if current is None:
+        current = max(history, key=lambda record: record.timestamp).revision
+
+    by_key: dict[tuple[str, str, str, str, str, str, str], list[HistoryRecord]] = {}
+    for record in history:
+        by_key.setdefault(record.key(), []).append(record)
+
+    regressions = 0
+    for key, records in sorted(by_key.items()):
+        current_records = [rec for rec in records if rec.revision == current]
+        if not current_records:
+            continue
+        base_revision = baseline
+        if base_revision is None:
+            older = [rec for rec in records if rec.revision != current]
+            if not older:
+                continue
+            base_revision = max(older, key=lambda record: record.timestamp).revision
+        base_records = [rec for rec in records if rec.revision == base_revision]
+        unit_labels = {rec.unit_label() for rec in (*current_records, *base_records)}
+        per_unit = len(unit_labels) == 1 and all(
+            rec.time_per_unit() is not None for rec in (*current_records, *base_records)
+        )
+        if not per_unit:
+            input_hashes = {rec.input_hash for rec in current_records}
+            base_records = [
+                rec for rec in base_records if rec.input_hash in input_hashes
+            ]
+        if not base_records:
+            continue
+
+        current_median = statistics.median(_compared_times(current_records, per_unit))
+        base_median = statistics.median(_compared_times(base_records, per_unit))
+        change = current_median / base_median - 1
+        regressed = change > threshold
+        regressions += regressed
+        day, function_name, input_name, run_config, gc_tuning, _, _ = key
+        scale, per = (1000, f" per 1k {unit_labels.pop()}") if per_unit else (1, "")
+        how = " ".join(filter(None, (run_config, gc_tuning and f"gc={gc_tuning}")))
+        print(
+            f"{'REGRESSED' if regressed else 'ok':9s} {day} {function_name} {input_name} "
+            f"{f'[{how}] ' if how else ''}"
+            f"{base_median * scale:.9f} ({base_revision}) -> "
+            f"{current_median * scale:.9f} ({current}){per} {change:+.1%}"
+        )
+    return regressions
+
+
+class ScalingPoint(NamedTuple):
+    """Time, throughput and peak memory of a day for one size of generated input."""
+
+    scale: float
+    input_bytes: int
+    time: float
+    peak_bytes: int
+    throughput: Throughput
+
+
+def fit_exponent(sizes: list[int], values: list[float]) -> float | None:
+    """The k that best fits values ~ sizes**k, None if it can't be fitted."""
+    points = [(size, value) for size, value in zip(sizes, values) if value > 0]
+    try:
+        return statistics.linear_regression(
+            [math.log(size) for size, _ in points],
+            [math.log(value) for _, value in points],
+        ).slope
+    except statistics.StatisticsError:  # Fewer than 2 points or no size change
+        return None
+
+
+def scaling(
+    day: str,
+    scales: list[float],
+    seed: int = 0,
+    repeats: int = 3,
+    budget: float = 60,
+) -> dict[str, list[ScalingPoint]]:
+    """
+    Run each of a day's functions over generated inputs of increasing scale
+    with cold caches, recording the median time, the throughput it gives and
+    the peak memory of each.
+    A function stops growing once a call has taken longer than budget seconds.
+    """
+    results: dict[str, list[ScalingPoint]] = {}
+    over_budget = set()
+    day_mod = importlib.import_module(day)
+    for scale in scales:
+        input_file = generated_input(day, scale, seed)
+        for answer in get_all_days(False, needs_answer=False, generated=True):
+            if answer.input_file != input_file or answer.function_name in over_budget:
+                continue
+            assert answer.function_name is not None
+            part_function = getattr(day_mod, answer.function_name)
+            times = []
+            for _ in range(repeats):
+                clear_caches()
+                start = time.perf_counter()
+                part_function(input_file)
+                times.append(time.perf_counter() - start)
+                if times[-1] > budget:
+                    over_budget.add(answer.function_name)
+                    break
+            clear_caches()
+            _, memory = measure_memory(part_function, input_file, top=0)
+            median_time = statistics.median(times)
+            results.setdefault(answer.function_name, []).append(
+                ScalingPoint(
+                    scale,
+                    input_file.stat().st_size,
+                    median_time,
+                    memory.peak_bytes,
+                    Throughput.measure(day, input_file, median_time),
+                )
+            )
+    return results
+
+
+def _format_exponent(exponent: float | None) -> str:
+    return "n/a" if exponent is None else f"n^{exponent:.2f}"
+
+
+def _run_scaling(
+    days: list[str], scales: list[float], seed: int, repeats: int, budget: float
+) -> None:
+    for day in days:
+        for function_name, points in scaling(
+            day, scales, seed, repeats, budget
+        ).items():
+            sizes = [point.input_bytes for point in points]
+            time_exponent = fit_exponent(sizes, [point.time for point in points])
+            memory_exponent = fit_exponent(
+                sizes, [point.peak_bytes for point in points]
+            )
+            units = [
+                point.throughput.units
+                for point in points
+                if point.throughput.units is not None
+            ]
+            per_unit = ""
+            if len(units) == len(points):
+                # How the time grows with the work in the input rather than its bytes
+                unit_exponent = fit_exponent(units, [point.time for point in points])
+                per_unit = (
+                    f" ({_format_exponent(unit_exponent)} in "
+                    f"{points[0].throughput.unit_name})"
+                )
+            print(
+                f"{day} {function_name} time ~ {_format_exponent(time_exponent)}"
+                f"{per_unit} peak memory ~ {_format_exponent(memory_exponent)}"
+            )
+            for point in points:
+                print(
+                    f"    x{point.scale:<6g} {point.input_bytes / 1024:10.1f}KiB "
+                    f"{point.time:12.6f}s peak {point.peak_bytes / 2**20:9.2f}MiB "
+                    f"{point.throughput.rates()}"
+                )
+
+
+class _SolveHandler(socketserver.StreamRequestHandler):
+    """Handle JSON line requests to solve a day until the client disconnects."""
+
+    server: _SolveServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = self.server.solve(json.loads(line))
+            except Exception as exc:  # Report anything going wrong to the client
+                response = {"error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _SolveServer(socketserver.UnixStreamServer):
+    """Solve requests sequentially with all the days imported up front."""
+
+    def __init__(self, socket_file: Path) -> None:
+        self.day_mods: dict[str, Any] = {}
+        self.default_functions: dict[str, str] = {}
+        for answer in get_all_days(False, needs_answer=False):
+            if answer.function_name is None:
+                continue
+            if answer.module_name not in self.day_mods:
+                self.day_mods[answer.module_name] = importlib.import_module(
+                    answer.module_name
+                )
+            self.default_functions.setdefault(answer.module_name, answer.function_name)
+        super().__init__(str(socket_file), _SolveHandler)
+
+    def solve(self, request: dict[str, Any]) -> dict[str, Any]:
+        day = request["day"]
+        function_name = request.get("function") or self.default_functions[day]
+        part_function = getattr(self.day_mods[day], function_name)
+        with contextlib.ExitStack() as stack:
+            if "input_path" in request:
+                input_file = Path(request["input_path"])
+            else:
+                input_file = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+                input_file = input_file / day
+                input_file.write_text(request["input"])
+            clear_caches()
+            start = time.perf_counter()
+            result = part_function(input_file)
+            duration = time.perf_counter() - start
+        return {
+            "day": day,
+            "function": function_name,
+            "result": result,
+            "time": duration,
+        }
+
+
+def serve(socket_file: Path = SOCKET_FILE) -> None:
+    """
+    Solve days for clients of the Unix socket, each request is a JSON line
+    with the day, optionally the function and either the input_path or the
+    input text. Responses are JSON lines with the result and solve time.
+    """
+    socket_file.unlink(missing_ok=True)
+    with _SolveServer(socket_file) as server:
+        print(f"Serving {len(server.day_mods)} days on {socket_file}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_file.unlink(missing_ok=True)
+
+
+def solve_remote(
+    day: str,
+    input_file: Path | None = None,
+    input_text: str | None = None,
+    function_name: str | None = None,
+    socket_file: Path = SOCKET_FILE,
+) -> dict[str, Any]:
+    """Ask the solver server for an answer and the time it took."""
+    request: dict[str, Any] = {"day": day, "function": function_name}
+    if input_file is not None:
+        request["input_path"] = str(input_file.resolve())
+    else:
+        request["input"] = input_text
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_file))
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            response: dict[str, Any] = json.loads(stream.readline())
+    return response
+
+
+class SolveRequest(NamedTuple):
+    """A day to solve, by default on its real input with its answers function."""
+
+    day: str
+    input_file: Path | None = None
+    function_name: str | None = None
+
+
+def _solve_day(day: str, input_file: Path | None, function_name: str | None) -> Any:
+    """Solve a day in a pool worker, which keeps the days it has imported."""
+    if function_name is None:
+        function_name = load_manifest().real_functions[day][0]
+    part_function = getattr(importlib.import_module(day), function_name)
+    clear_caches()
+    return part_function(INPUT_DIR / "real" / day if input_file is None else input_file)
+
+
+class SolveExecutor(ProcessPoolExecutor):
+    """
+    A process pool for solving days from asyncio without blocking the event
+    loop. At most limit solves are handed to the workers at once, by default
+    one per worker, the rest wait their turn.
+    """
+
+    def __init__(self, max_workers: int | None = None, limit: int | None = None):
+        super().__init__(max_workers)
+        self.limit = limit or self._max_workers  # type: ignore[attr-defined]
+        self._limit_loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    def _limiter(self) -> asyncio.Semaphore:
+        # A semaphore only works in one event loop, so start again in a new one
+        loop = asyncio.get_running_loop()
+        if loop is not self._limit_loop:
+            self._limit_loop, self._semaphore = loop, asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    async def solve(
+        self,
+        day: str,
+        input_file: Path | None = None,
+        function_name: str | None = None,
+    ) -> Any:
+        """
+        Cancelling a solve that is waiting to start means it never runs, one
+        already running finishes in its worker and the result is dropped.
+        """
+        async with self._limiter():
+            return await asyncio.get_running_loop().run_in_executor(
+                self, _solve_day, day, input_file, function_name
+            )
+
+    async def as_completed(
+        self, requests: Iterable[SolveRequest]
+    ) -> AsyncIterator[tuple[SolveRequest, Any]]:
+        """
+        Yield each request with its result as they finish. Any left are
+        cancelled if one fails or the caller stops iterating.
+        """
+        tasks = {
+            asyncio.ensure_future(self.solve(*request)): request for request in requests
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield tasks[task], task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+_default_executor: SolveExecutor | None = None
+
+
+async def solve(
+    day: str,
+    input_file: Path | None = None,
+    *,
+    function_name: str | None = None,
+    executor: SolveExecutor | None = None,
+) -> Any:
+    """Solve a day from asyncio, by default in a pool shared by all callers."""
+    global _default_executor
+    if executor is None:
+        if _default_executor is None:
+            _default_executor = SolveExecutor()
+        executor = _default_executor
+    return await executor.solve(day, input_file, function_name)
+
+
+# Modules only the harness needs, a day that imports any of them pays for it
+# every time it starts up
+HARNESS_ONLY_MODULES = (
+    "harness",
+    "argparse",
+    "concurrent.futures",
+    "inspect",
+    "json",
+    "subprocess",
+    "timeit",
+    "tracemalloc",
+)
+
+
+def import_times(module_name: str, repeats: int = 5) -> dict[str, tuple[int, int]]:
+    """
+    The self and cumulative microseconds -X importtime reports for each module
+    imported when importing module_name in a new interpreter, the fastest of
+    repeats runs since the first can include compiling.
+    """
+    times: dict[str, tuple[int, int]] = {}
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stderr
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+            new_times = (int(self_us), int(cumulative_us))
+            old_times = times.get(name.strip(), new_times)
+            times[name.strip()] = (
+                min(old_times[0], new_times[0]),
+                min(old_times[1], new_times[1]),
+            )
+    return times
+
+
+def _run_import_times(days: list[str], repeats: int, top: int) -> int:
+    """Print how long each day takes to import, returning the number of days
+    importing modules only the harness should need."""
+    slow_days = 0
+    for day in days:
+        times = import_times(day, repeats)
+        print(
+            f"{day} {times[day][1] / 1000:.1f}ms "
+            f"(utils {times['utils'][1] / 1000:.1f}ms, {day} itself {times[day][0] / 1000:.1f}ms)"
+        )
+        by_self_time = sorted(times.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (self_us, _) in by_self_time[:top]:
+            print(f"    {self_us / 1000:6.1f}ms {name}")
+        if harness_imports := [name for name in HARNESS_ONLY_MODULES if name in times]:
+            print(
+                f"    imports {', '.join(harness_imports)} which only the harness needs"
+            )
+            slow_days += 1
+    return slow_days
+
+
+def load_test_durations() -> dict[str, float]:
+    """Seconds each answer test last took, by test name."""
+    if not TEST_DURATIONS_FILE.exists():
+        return {}
+    durations: dict[str, float] = json.loads(TEST_DURATIONS_FILE.read_text() or "{}")
+    return durations
+
+
+def record_test_durations(durations: dict[str, float]) -> None:
+    """Merge into the recorded durations, locked as the shards finish together."""
+    with TEST_DURATIONS_FILE.open("a+") as durations_file:
+        fcntl.flock(durations_file, fcntl.LOCK_EX)
+        durations_file.seek(0)
+        recorded = json.loads(durations_file.read() or "{}")
+        recorded.update(durations)
+        durations_file.truncate(0)
+        durations_file.write(json.dumps(recorded, indent=0, sort_keys=True))
+
+
+def lpt_shards(durations: dict[str, float], num_shards: int) -> list[list[str]]:
+    """
+    Split the names into shards of about the same total duration, longest
+    processing time first with each going to the least loaded shard so far.
+    """
+    shards: list[list[str]] = [[] for _ in range(num_shards)]
+    loads = [(0.0, index) for index in range(num_shards)]
+    for name in sorted(durations, key=lambda name: (-durations[name], name)):
+        load, index = heapq.heappop(loads)
+        shards[index].append(name)
+        heapq.heappush(loads, (load + durations[name], index))
+    return shards
+
+
+def run_tests(jobs: int, pytest_args: list[str]) -> int:
+    """
+    Run the tests as jobs pytest processes, each running the shard of tests
+    given to it by lpt_shards, and return the worst exit code.
+    """
+    commands = [
+        [sys.executable, "-m", "pytest", f"--shard={shard}/{jobs}", *pytest_args]
+        for shard in range(1, jobs + 1)
+    ]
+    exit_code = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        runs = [
+            pool.submit(
+                subprocess.run,
+                command,
+                cwd=Path(__file__).parent,
+                capture_output=True,
+                text=True,
+            )
+            for command in commands
+        ]
+        for run in as_completed(runs):
+            completed = run.result()
+            print(completed.stdout, end="")
+            print(completed.stderr, end="", file=sys.stderr)
+            # Exit code 5 is a shard with no tests, fine when there are few
+            if completed.returncode != 5:
+                exit_code = max(exit_code, completed.returncode)
+    return exit_code
+
+
+def _main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Time days and track timings")
+    subparsers = parser.add_subparsers(dest="command")
+    run_parser = subparsers.add_parser("run", help="Time each day (default)")
+    run_parser.add_argument("days", nargs="*", help="Days to time, all if none given")
+    run_parser.add_argument(
+        "--jobs", "-j", default=1, type=int, help="Number of worker processes"
+    )
+    run_parser.add_argument(
+        "--threads",
+        default=1,
+        type=int,
+        help="Number of worker threads sharing the days, for free-threaded builds",
+    )
+    run_parser.add_argument(
+        "--example", action="store_true", help="Time example inputs not real"
+    )
+    run_parser.add_argument(
+        "--generated",
+        action="store_true",
+        help=f"Time the inputs in {GENERATED_DIR} not real",
+    )
+    run_parser.add_argument(
+        "--repeats",
+        default=0,
+        type=int,
+        help="Report min/median/IQR of this many timed calls rather than an average",
+    )
+    run_parser.add_argument(
+        "--warmup", default=1, type=int, help="Untimed calls after the cold call"
+    )
+    run_parser.add_argument(
+        "--no-gc", action="store_true", help="Disable GC during the timed calls"
+    )
+    run_parser.add_argument(
+        "--gc",
+        type=_gc_tuning_arg,
+        help="GC tuning for every day rather than those in the answers, "
+        "e.g. disable, freeze or threshold=50000",
+    )
+    run_parser.add_argument("--cpu", type=int, help="Pin the timing to this CPU")
+    run_parser.add_argument(
+        "--caches",
+        choices=("warm", "cold"),
+        default="warm",
+        help="Keep registered caches between calls or clear them before each",
+    )
+    run_parser.add_argument(
+        "--phases", action="store_true", help="Report the time of each phase"
+    )
+    run_parser.add_argument(
+        "--trace", type=Path, help="Write the phases to a Chrome trace JSON file"
+    )
+    run_parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Report memory from tracemalloc for an extra run of each day",
+    )
+    run_parser.add_argument(
+        "--counters",
+        action="store_true",
+        help="Report the counters of work done that each day keeps for an extra run",
+    )
+    run_parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="Load what the days parse functions returned before, to time the rest",
+    )
+    run_parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help=f"Profile an extra run of each day, writing the profile to {PROFILE_DIR}",
+    )
+    compare_parser = subparsers.add_parser(
+        "compare", help="Fail if any day has slowed down in the benchmark history"
+    )
+    compare_parser.add_argument(
+        "--threshold",
+        default=0.1,
+        type=float,
+        help="Fractional slow down of the median that counts as a regression",
+    )
+    compare_parser.add_argument("--baseline", help="Revision to compare against")
+    compare_parser.add_argument("--current", help="Revision to check")
+    generate_parser = subparsers.add_parser(
+        "generate", help=f"Write synthetic inputs to {GENERATED_DIR}"
+    )
+    generate_parser.add_argument(
+        "days", nargs="*", help="Days to generate, all if none given"
+    )
+    generate_parser.add_argument(
+        "--scale",
+        default=[1.0],
+        type=float,
+        nargs="+",
+        help="Sizes relative to the real input",
+    )
+    generate_parser.add_argument("--seed", default=0, type=int, help="Random seed")
+    scaling_parser = subparsers.add_parser(
+        "scaling",
+        help="Fit how time and peak memory grow with the size of generated inputs",
+    )
+    scaling_parser.add_argument(
+        "days", nargs="*", help="Days to scale, all if none given"
+    )
+    scaling_parser.add_argument(
+        "--max-scale",
+        default=64,
+        type=int,
+        help="Largest size relative to the real input, sizes double from 1",
+    )
+    scaling_parser.add_argument("--seed", default=0, type=int, help="Random seed")
+    scaling_parser.add_argument(
+        "--repeats", default=3, type=int, help="Timed calls for each size"
+    )
+    scaling_parser.add_argument(
+        "--budget",
+        default=60,
+        type=float,
+        help="Stop growing a day once a call takes longer than this many seconds",
+    )
+    serve_parser = subparsers.add_parser(
+        "serve", help="Solve requests on a Unix socket with the days preloaded"
+    )
+    serve_parser.add_argument(
+        "--socket", default=SOCKET_FILE, type=Path, help="Socket to listen on"
+    )
+    solve_parser = subparsers.add_parser(
+        "solve", help="Solve a day with the server started by serve"
+    )
+    solve_parser.add_argument("day", help="Day to solve")
+    solve_parser.add_argument(
+        "input", nargs="?", type=Path, help="Input file, stdin if not given"
+    )
+    solve_parser.add_argument(
+        "--function", help="Function to call, that for the real input if not given"
+    )
+    solve_parser.add_argument(
+        "--socket", default=SOCKET_FILE, type=Path, help="Socket of the server"
+    )
+    importtime_parser = subparsers.add_parser(
+        "importtime",
+        help="Report the import time of days and fail if they import the harness",
+    )
+    importtime_parser.add_argument(
+        "days", nargs="*", help="Days to import, all if none given"
+    )
+    importtime_parser.add_argument(
+        "--repeats", default=5, type=int, help="Imports of each day, the fastest counts"
+    )
+    importtime_parser.add_argument(
+        "--top", default=5, type=int, help="Modules to show with the longest import"
+    )
+
+    ab_parser = subparsers.add_parser(
+        "ab",
+        help="Check other implementations of days agree and benchmark them",
+    )
+    ab_parser.add_argument(
+        "days", nargs="*", help="Days to compare, all with other implementations"
+    )
+    ab_parser.add_argument(
+        "--example", action="store_true", help="Use the example inputs not real"
+    )
+    ab_parser.add_argument(
+        "--generated",
+        action="store_true",
+        help=f"Use the inputs in {GENERATED_DIR} not real",
+    )
+    ab_parser.add_argument(
+        "--repeats", default=5, type=int, help="Timed calls of each implementation"
+    )
+    ab_parser.add_argument(
+        "--warmup", default=1, type=int, help="Untimed calls after the cold call"
+    )
+    ab_parser.add_argument(
+        "--no-gc", action="store_true", help="Disable GC during the timed calls"
+    )
+    ab_parser.add_argument(
+        "--cold-caches",
+        action="store_true",
+        help="Clear registered caches before every call",
+    )
+    ab_parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="Load what the days parse functions returned before, to time the rest",
+    )
+    gc_parser = subparsers.add_parser(
+        "gc", help="Benchmark days with different GC tunings side by side"
+    )
+    gc_parser.add_argument("days", nargs="*", help="Days to compare, all if none given")
+    gc_parser.add_argument(
+        "--tuning",
+        action="append",
+        default=[],
+        type=_gc_tuning_arg,
+        help="GC tuning to compare, can be repeated, the first is the base, "
+        "default: default, that in the answers, disable and freeze",
+    )
+    gc_parser.add_argument(
+        "--example", action="store_true", help="Use the example inputs not real"
+    )
+    gc_parser.add_argument(
+        "--generated",
+        action="store_true",
+        help=f"Use the inputs in {GENERATED_DIR} not real",
+    )
+    gc_parser.add_argument(
+        "--repeats", default=5, type=int, help="Timed calls with each tuning"
+    )
+    gc_parser.add_argument(
+        "--warmup", default=1, type=int, help="Untimed calls after the cold call"
+    )
+    gc_parser.add_argument(
+        "--cold-caches",
+        action="store_true",
+        help="Clear registered caches before every call",
+    )
+    test_parser = subparsers.add_parser(
+        "test",
+        help="Run the tests in parallel shards balanced by their last durations, "
+        "other arguments are passed to pytest",
+    )
+    test_parser.add_argument(
+        "--jobs",
+        "-j",
+        default=os.cpu_count() or 1,
+        type=int,
+        help="Number of pytest processes",
+    )
+
+    if not argv or argv[0] not in (*subparsers.choices, "-h", "--help"):
+        # Running days is the default command
+        argv = ["run", *argv]
+    args, pytest_args = parser.parse_known_args(argv)
+    if args.command == "test":
+        return run_tests(args.jobs, pytest_args)
+    if pytest_args:
+        parser.error(f"unrecognized arguments: {' '.join(pytest_args)}")
+    if args.command == "run" and args.cpu is not None and args.jobs > 1:
+        parser.error("--cpu can't be used with --jobs")
+    if args.command == "run" and args.threads > 1:
+        if args.jobs > 1:
+            parser.error("--threads can't be used with --jobs")
+        # These all change state shared by every thread
+        if (
+            args.cpu is not None
+            or args.no_gc
+            or args.caches == "cold"
+            or args.phases
+            or args.trace
+            or args.memory
+            or args.profile
+            or args.counters
+            or args.gc
+        ):
+            parser.error(
+                "--threads can't be used with --cpu, --no-gc, --gc, --caches cold, "
+                "--phases, --trace, --memory, --profile or --counters"
+            )
+    if getattr(args, "parse_cache", False):
+        # In the environment so that worker processes use it too
+        os.environ["AOC_PARSE_CACHE"] = "1"
+    if args.command == "compare":
+        regressions = compare_history(args.threshold, args.baseline, args.current)
+        return 1 if regressions else 0
+    if args.command == "ab":
+        config = RunConfig(
+            max(1, args.repeats),
+            args.warmup,
+            args.no_gc,
+            cold_caches=args.cold_caches,
+        )
+        disagreements = compare_implementations(
+            args.days, config, args.example, args.generated
+        )
+        return 1 if disagreements else 0
+    if args.command == "gc":
+        config = RunConfig(
+            max(1, args.repeats), args.warmup, cold_caches=args.cold_caches
+        )
+        compare_gc_tunings(args.days, args.tuning, config, args.example, args.generated)
+        return 0
+    if args.command == "importtime":
+        days = args.days or sorted(
+            {answer.module_name for answer in get_all_days(False, False)}
+        )
+        return 1 if _run_import_times(days, args.repeats, args.top) else 0
+    if args.command == "serve":
+        serve(args.socket)
+        return 0
+    if args.command == "solve":
+        response = solve_remote(
+            args.day,
+            args.input,
+            None if args.input else sys.stdin.read(),
+            args.function,
+            args.socket,
+        )
+        print(json.dumps(response))
+        return 1 if "error" in response else 0
+    if args.command in ("generate", "scaling"):
+        # By default every day that has a generator
+        days = args.days or sorted(
+            day
+            for day in {answer.module_name for answer in get_all_days(False, False)}
+            if hasattr(importlib.import_module(day), "generate")
+        )
+    if args.command == "generate":
+        for day in days:
+            for scale in args.scale:
+                print(generated_input(day, scale, args.seed))
+        return 0
+    if args.command == "scaling":
+        scales = [2**power for power in range(args.max_scale.bit_length())]
+        _run_scaling(days, scales, args.seed, args.repeats, args.budget)
+        return 0
+    config = RunConfig(
+        args.repeats,
+        args.warmup,
+        args.no_gc,
+        args.cpu,
+        args.caches == "cold",
+        args.phases,
+        args.trace is not None,
+        args.memory,
+        args.profile,
+        args.counters,
+        args.gc,
+    )
+    failures = _run_all(
+        args.days,
+        args.jobs,
+        args.example,
+        config,
+        args.trace,
+        args.generated,
+        args.threads,
+    )
+    return 1 if failures else 0
@@ -1,21 +1,42 @@
 import importlib
+from typing import Any, Callable
 
 import pytest
-from utils import AnswerEntry, get_all_days, process_result
+from harness import cached_solve
+from utils import AnswerEntry, get_all_days, implementations, process_result
 
 
-def _process_answer_entry(entry: AnswerEntry) -> None:
-    day_mod = importlib.__import__(entry.module_name)
+def _process_answer_entry(
+    entry: AnswerEntry, record_property: Callable[[str, Any], None]
+) -> None:
+    importlib.__import__(entry.module_name)
     assert entry.function_name is not None
-    part_function = getattr(day_mod, entry.function_name)
-    process_result(entry, part_function(entry.input_file))
+    # Any other implementations of the function have to get the answer too
+    for part_function in implementations(entry.module_name, entry.function_name):
+        result, cached = cached_solve(
+            part_function,
+            entry.input_file,
+            time_budget=entry.time_budget,
+            memory_budget=entry.memory_budget,
+        )
+        if cached:  # Not a solve time so not to be used to balance the shards
+            record_property("cached", True)
+        process_result(entry, result)
 
 
-@pytest.mark.parametrize("entry", get_all_days(examples=True))
-def test_puzzle_examples(entry: AnswerEntry) -> None:
-    _process_answer_entry(entry)
+def _entry_id(entry: AnswerEntry) -> str:
+    return f"{entry.result_name().rstrip()}-{entry.function_name}"
 
 
-@pytest.mark.parametrize("entry", get_all_days(examples=False))
-def test_puzzles(entry: AnswerEntry) -> None:
-    _process_answer_entry(entry)
+@pytest.mark.parametrize("entry", get_all_days(examples=True), ids=_entry_id)
+def test_puzzle_examples(
+    entry: AnswerEntry, record_property: Callable[[str, Any], None]
+) -> None:
+    _process_answer_entry(entry, record_property)
+
+
+@pytest.mark.parametrize("entry", get_all_days(examples=False), ids=_entry_id)
+def test_puzzles(
+    entry: AnswerEntry, record_property: Callable[[str, Any], None]
+) -> None:
+    _process_answer_entry(entry, record_property)
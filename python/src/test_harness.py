@@ -0,0 +1,150 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import harness
+import pytest
+from harness import BenchStats, GCTuning, fit_exponent, lpt_shards
+
+
+def _record(revision: str, timestamp: float, avg_time: float, **fields: Any) -> str:
+    record = {
+        "day": "d01",
+        "function_name": "p1p2",
+        "input_name": "real/d01",
+        "input_hash": "a",
+        "revision": revision,
+        "timestamp": timestamp,
+        "avg_time": avg_time,
+        "num_calls": 1,
+        "run_config": "autorange",
+        "machine": "host x86_64",
+        "python": "CPython 3.12.1",
+        **fields,
+    }
+    return json.dumps(record)
+
+
+@pytest.fixture
+def history_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    history_file = tmp_path / "bench_history.jsonl"
+    monkeypatch.setattr(harness, "HISTORY_FILE", history_file)
+    return history_file
+
+
+@pytest.mark.parametrize(
+    "threshold, regressions", [(0.1, 0), (0.04, 1)], ids=["within", "over"]
+)
+def test_compare_history_threshold(
+    history_file: Path, threshold: float, regressions: int
+) -> None:
+    history_file.write_text(
+        _record("r1", 1, 1.0) + "\n" + _record("r2", 2, 1.05) + "\n"
+    )
+    assert harness.compare_history(threshold) == regressions
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("machine", "other aarch64"),
+        ("python", "CPython 3.13.0"),
+        ("run_config", "autorange parse-cache"),
+        ("gc_tuning", "freeze"),
+    ],
+)
+def test_compare_history_like_with_like(
+    history_file: Path, capsys: pytest.CaptureFixture[str], field: str, value: str
+) -> None:
+    history_file.write_text(
+        _record("r1", 1, 1.0) + "\n" + _record("r2", 2, 2.0, **{field: value}) + "\n"
+    )
+    assert harness.compare_history(0.1) == 0
+    assert "d01" not in capsys.readouterr().out
+
+
+def test_compare_history_per_unit(
+    history_file: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # Twice the work in not quite twice the time isn't a regression
+    sizes = {"input_bytes": 100, "input_lines": 10, "unit_name": "cells"}
+    history_file.write_text(
+        _record("r1", 1, 1.0, units=10, **sizes)
+        + "\n"
+        + _record("r2", 2, 1.9, input_hash="b", units=20, **sizes)
+        + "\n"
+    )
+    assert harness.compare_history(0.1) == 0
+    assert "per 1k cells -5.0%" in capsys.readouterr().out
+
+
+def test_compare_history_other_input_without_sizes(
+    history_file: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    history_file.write_text(
+        _record("r1", 1, 1.0) + "\n" + _record("r2", 2, 2.0, input_hash="b") + "\n"
+    )
+    assert harness.compare_history(0.1) == 0
+    assert "d01" not in capsys.readouterr().out
+
+
+def test_load_history_skips_malformed_lines(history_file: Path) -> None:
+    history_file.write_text(
+        "\n".join(
+            [
+                _record("r1", 1, 1.0),
+                "",
+                _record("r2", 2, 1.0)[:40],  # Cut short
+                "[1, 2]",
+                json.dumps({"day": "d01"}),
+                _record("r2", 2, 1.0, unknown_field=1),
+                _record("r2", 2, 1.0, num_calls="many"),
+                _record("r3", 3, 1.0),
+            ]
+        )
+    )
+    assert [record.revision for record in harness.load_history()] == ["r1", "r3"]
+
+
+def test_lpt_shards() -> None:
+    durations = {"a": 5.0, "b": 4.0, "c": 3.0, "d": 3.0, "e": 1.0}
+    assert lpt_shards(durations, 2) == [["a", "d"], ["b", "c", "e"]]
+    assert lpt_shards(durations, 6)[5] == []
+
+
+@pytest.mark.parametrize(
+    "spec, tuning",
+    [
+        ("default", GCTuning()),
+        ("disable", GCTuning(disable=True)),
+        ("freeze+threshold=50000", GCTuning(freeze=True, threshold=(50000,))),
+        ("threshold=700,10,10", GCTuning(threshold=(700, 10, 10))),
+    ],
+)
+def test_gc_tuning_parse(spec: str, tuning: GCTuning) -> None:
+    assert GCTuning.parse(spec) == tuning
+    assert GCTuning.parse(str(tuning)) == tuning
+
+
+@pytest.mark.parametrize(
+    "spec", ["fast", "threshold", "threshold=a", "threshold=1,2,3,4", "disable=1"]
+)
+def test_gc_tuning_parse_invalid(spec: str) -> None:
+    with pytest.raises(ValueError):
+        GCTuning.parse(spec)
+
+
+def test_fit_exponent() -> None:
+    sizes = [1, 2, 4, 8]
+    assert fit_exponent(sizes, [size**2 for size in sizes]) == pytest.approx(2)
+    # Values of zero can't be fitted so are left out
+    assert fit_exponent(sizes, [0, 2, 4, 8]) == pytest.approx(1)
+    assert fit_exponent([1], [1.0]) is None
+    assert fit_exponent([2, 2], [1.0, 3.0]) is None
+
+
+def test_bench_stats() -> None:
+    stats = BenchStats.from_samples(0.5, [5.0, 1.0, 4.0, 2.0, 3.0])
+    assert stats == BenchStats(0.5, 1.0, 3.0, 1.5, 4.5, 5)
+    assert stats.iqr == 3.0
+    assert BenchStats.from_samples(0.5, [2.0]) == BenchStats(0.5, 2.0, 2.0, 2.0, 2.0, 1)
@@ -1,16 +1,29 @@
-import argparse
-import importlib
-import inspect
-import json
+from __future__ import annotations
+
+import contextlib
+import functools
+import gc
+import mmap
+import os
 import sys
+import threading
 import time
-import timeit
 from pathlib import Path
-from typing import Any, NamedTuple
+from typing import TYPE_CHECKING, Any, Callable, Iterator, NamedTuple, TypeVar
+
+if TYPE_CHECKING:
+    from harness import SolveExecutor
+
+# Days import this module so keep its imports light, everything only needed to
+# run the days from the command line is in harness which is imported lazily
 
 REPO_ROOT = Path(__file__).resolve().parent.parent.parent
 ANSWER_FILE = REPO_ROOT / "answers.json"
 INPUT_DIR = REPO_ROOT / "input"
+MANIFEST_CACHE = REPO_ROOT / ".manifest_cache"
+GENERATED_DIR = INPUT_DIR / "generated"
+
+T = TypeVar("T")
 
 
 class AnswerEntry(NamedTuple):
@@ -22,19 +35,90 @@ class AnswerEntry(NamedTuple):
     input_file: Path
     expected_result: tuple[Any]
     input_file_suffix: str
+    time_budget: float | None = None  # Seconds
+    memory_budget: int | None = None  # Bytes
+    gc_tuning: str | None = None  # See harness.GCTuning
+
+    @property
+    def is_generated(self) -> bool:
+        return self.input_file.parent == GENERATED_DIR
 
     def result_name(self) -> str:
         if self.is_example:
             i_suffix = "-" + self.input_file_suffix if self.input_file_suffix else ""
             input_txt = "exmaple" + i_suffix
+        elif self.is_generated:
+            input_txt = "gen" + self.input_file_suffix
         else:
             input_txt = "real"
         return f"{self.module_name}-{input_txt:9s}"
 
 
-def get_all_days(examples: bool, needs_answer: bool = True) -> list[AnswerEntry]:
+class Manifest:
+    """
+    Every entry in ANSWER_FILE, followed by an entry without a function or
+    answer for each input that isn't in it, indexed by day and input.
+    """
+
+    def __init__(self, entries: list[AnswerEntry]) -> None:
+        self.entries = entries
+        self.by_day: dict[str, list[AnswerEntry]] = {}
+        self.by_input: dict[tuple[str, bool, str], list[AnswerEntry]] = {}
+        self.real_functions: dict[str, list[str]] = {}
+        for entry in entries:
+            self.by_day.setdefault(entry.module_name, []).append(entry)
+            self.by_input.setdefault(
+                (entry.module_name, entry.is_example, entry.input_file_suffix), []
+            ).append(entry)
+            if entry.function_name and not entry.is_example:
+                day_functions = self.real_functions.setdefault(entry.module_name, [])
+                if entry.function_name not in day_functions:
+                    day_functions.append(entry.function_name)
+
+    def day_entries(self, day: str) -> list[AnswerEntry]:
+        return self.by_day.get(day, [])
+
+    def input_entries(
+        self, day: str, is_example: bool, input_file_suffix: str = ""
+    ) -> list[AnswerEntry]:
+        return self.by_input.get((day, is_example, input_file_suffix), [])
+
+
+_manifest: tuple[tuple[int, ...], Manifest] | None = None
+
+
+_MANIFEST_VERSION = 3  # Change when the rows change so old caches are ignored
+
+
+def _manifest_key() -> tuple[int, ...]:
+    return (_MANIFEST_VERSION,) + tuple(
+        path.stat().st_mtime_ns if path.exists() else 0
+        for path in (ANSWER_FILE, INPUT_DIR / "examples", INPUT_DIR / "real")
+    )
+
+
+def _manifest_rows(key: tuple[int, ...]) -> list[tuple[Any, ...]]:
+    """
+    Rows of (day, function, is_example, expected result, input suffix, input
+    path relative to INPUT_DIR, time budget, memory budget, GC tuning), from
+    MANIFEST_CACHE if it is for the same modification times of the answers
+    and inputs.
+
+    Each entry in ANSWER_FILE can end with an input suffix and a dict of
+    options for solving it, budgets and the GC tuning the runner applies,
+    e.g. {"time": 30, "memory_mb": 1024, "gc": "freeze"}.
+    """
+    import marshal
+
+    with contextlib.suppress(OSError, EOFError, ValueError, TypeError):
+        cached_key, rows = marshal.loads(MANIFEST_CACHE.read_bytes())
+        if cached_key == key:
+            return list(rows)
+
+    import json
+
+    rows = []
     inputs_seen = set()
-    day_parts = []
     for (
         module_name,
         function_name,
@@ -46,47 +130,129 @@ def get_all_days(examples: bool, needs_answer: bool = True) -> list[AnswerEntry]
             expected_result = tuple(expected_result)
         else:
             expected_result = (expected_result,)
-
-        sub_dir = "examples" if is_example else "real"
-        input_file = INPUT_DIR / sub_dir / module_name
         input_file_suffix = ""
-        if optional_args:
-            input_file_suffix = optional_args[0]
-            input_file = input_file.parent / (input_file.name + input_file_suffix)
-
-        inputs_seen.add(input_file)
-        if needs_answer and any(res is None for res in expected_result):
-            # Only return this answer if all answers are known
-            print(f"Skipping {module_name} - {input_file} since not all answers known")
-            continue
-        if (is_example and examples) or (not is_example and not examples):
-            day_parts.append(
-                AnswerEntry(
-                    module_name,
-                    function_name,
-                    is_example,
-                    input_file,
-                    expected_result,
-                    input_file_suffix,
-                )
+        options: dict[str, Any] = {}
+        for optional_arg in optional_args:
+            if isinstance(optional_arg, dict):
+                options = optional_arg
+            else:
+                input_file_suffix = optional_arg
+        memory_budget_mb = options.get("memory_mb")
+        sub_dir = "examples" if is_example else "real"
+        input_path = f"{sub_dir}/{module_name}{input_file_suffix}"
+        inputs_seen.add(input_path)
+        rows.append(
+            (
+                module_name,
+                function_name,
+                is_example,
+                expected_result,
+                input_file_suffix,
+                input_path,
+                options.get("time"),
+                None if memory_budget_mb is None else int(memory_budget_mb * 2**20),
+                options.get("gc"),
             )
-
-    if not needs_answer:
-        # Check for any inputs that we don't have answers for yet
-        sub_dir = "examples" if examples else "real"
-        for input_file in (INPUT_DIR / sub_dir).glob("**/*"):
-            if input_file not in inputs_seen:
-                day_parts.append(
-                    AnswerEntry(
+        )
+    # Inputs that we don't have answers for yet
+    for is_example, sub_dir in ((True, "examples"), (False, "real")):
+        for input_file in sorted((INPUT_DIR / sub_dir).glob("**/*")):
+            input_path = str(input_file.relative_to(INPUT_DIR))
+            if input_path not in inputs_seen:
+                rows.append(
+                    (
                         input_file.name[:3],
                         None,
-                        examples,
-                        input_file,
+                        is_example,
                         (None,),
                         input_file.name[3:],
+                        input_path,
+                        None,
+                        None,
+                        None,
                     )
                 )
 
+    # Write then rename so parallel runs never see a partial file
+    with contextlib.suppress(OSError):
+        temp_file = MANIFEST_CACHE.with_name(f"{MANIFEST_CACHE.name}.{os.getpid()}")
+        temp_file.write_bytes(marshal.dumps((key, rows)))
+        temp_file.replace(MANIFEST_CACHE)
+    return rows
+
+
+def load_manifest() -> Manifest:
+    """
+    The manifest, only loaded again when ANSWER_FILE or the input directories
+    have been modified since it was last loaded.
+    """
+    global _manifest
+    key = _manifest_key()
+    if _manifest is None or _manifest[0] != key:
+        entries = [
+            AnswerEntry(
+                module_name,
+                function_name,
+                is_example,
+                INPUT_DIR / input_path,
+                expected_result,
+                input_file_suffix,
+                time_budget,
+                memory_budget,
+                gc_tuning,
+            )
+            for (
+                module_name,
+                function_name,
+                is_example,
+                expected_result,
+                input_file_suffix,
+                input_path,
+                time_budget,
+                memory_budget,
+                gc_tuning,
+            ) in _manifest_rows(key)
+        ]
+        _manifest = key, Manifest(entries)
+    return _manifest[1]
+
+
+def get_all_days(
+    examples: bool, needs_answer: bool = True, generated: bool = False
+) -> list[AnswerEntry]:
+    """
+    Get the answer entries for the example or real inputs, or with generated
+    an entry for each input in GENERATED_DIR using the real input's functions.
+    """
+    manifest = load_manifest()
+    if generated:
+        return [
+            AnswerEntry(
+                input_file.name[:3],
+                function_name,
+                False,
+                input_file,
+                (None,),
+                input_file.name[3:],
+            )
+            for input_file in sorted(GENERATED_DIR.glob("d??-*"))
+            for function_name in manifest.real_functions.get(input_file.name[:3], ())
+        ]
+
+    day_parts = []
+    for entry in manifest.entries:
+        if entry.is_example != examples:
+            continue
+        if needs_answer:
+            if entry.function_name is None:
+                continue
+            if any(res is None for res in entry.expected_result):
+                # Only return this answer if all answers are known
+                print(
+                    f"Skipping {entry.module_name} - {entry.input_file} since not all answers known"
+                )
+                continue
+        day_parts.append(entry)
     return day_parts
 
 
@@ -96,11 +262,11 @@ def _input_path(from_file: str, subdir: str) -> Path:
 
 
 def real_input(day: str = "") -> Path:
-    return _input_path(day if day else inspect.stack()[1].filename, "real")
+    return _input_path(day if day else sys._getframe(1).f_code.co_filename, "real")
 
 
 def example_input(day: str = "") -> Path:
-    return _input_path(day if day else inspect.stack()[1].filename, "examples")
+    return _input_path(day if day else sys._getframe(1).f_code.co_filename, "examples")
 
 
 def process_result(answer: AnswerEntry, result: Any) -> None:
@@ -115,89 +281,363 @@ def process_result(answer: AnswerEntry, result: Any) -> None:
             ), f"{answer.result_name()}-{part_idx} result wrong, expected: {expected_result_part} got {result_part}"
 
 
-def per_day_main(
-    part_function: Any,
-    input_file: str = "",
-) -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--example", action="store_true", help="Example only")
-    parser.add_argument("--real", action="store_true", help="Real only")
-    parser.add_argument(
-        "--repeat", default=1, type=int, help="Number of times to run the test"
-    )
-    args = parser.parse_args()
-    day = Path(inspect.stack()[1].filename).stem
-
-    example_only = input_file == "example" or args.example
-    real_only = input_file == "real" or args.real
-    input_suffix = "" if input_file in ("example", "real") else input_file
-
-    def _get_day_info(day: str) -> list[AnswerEntry]:
-        day_info = []
-        for example in (True, False):
-            for entry in get_all_days(example, needs_answer=False):
-                if entry.module_name == day:
-                    day_info.append(entry)
-        return day_info
-
-    day_answers = _get_day_info(day)
-    to_check = []
-    day_mod: Any = None
-    for answer in day_answers:
-        if answer.is_example and real_only or (not answer.is_example and example_only):
-            continue
-        if input_suffix and answer.input_file_suffix != input_suffix:
-            continue
-        if answer.function_name:
-            # If the function name is in the answer entry then use that
-            # rather than what was passed in
-            day_mod = importlib.__import__(day) if day_mod is None else day_mod
-            part_function = getattr(day_mod, answer.function_name)
-        start = time.perf_counter()
-        for _ in range(args.repeat):
-            result = part_function(answer.input_file)
-        duration = time.perf_counter() - start
-        print(
-            f"{answer.result_name()} = {result} (in {duration / args.repeat:.3f}s) - expecting {answer.expected_result}"
+_CACHES: dict[str, functools._lru_cache_wrapper[Any]] = {}
+
+
+class CacheStats(NamedTuple):
+    """Usage of a registered cache."""
+
+    name: str
+    hits: int
+    misses: int
+    size: int
+    maxsize: int | None
+    num_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def __str__(self) -> str:
+        bound = f"/{self.maxsize}" if self.maxsize is not None else ""
+        return (
+            f"{self.name} {self.hits} hits {self.misses} misses ({self.hit_rate:.1%}) "
+            f"size {self.size}{bound} ~{self.num_bytes / 1024:.1f}KiB"
         )
-        to_check.append((answer, result))
-    for answer, result in to_check:
-        process_result(answer, result)
 
 
-def _run_all(days: list[str]) -> None:
+def memoize(
+    maxsize: int | None = None,
+) -> Callable[[Callable[..., T]], functools._lru_cache_wrapper[T]]:
     """
-    Get data from running each day on its own then all days in one go.
+    Like functools.lru_cache but the cache is registered so that the runner can
+    clear it between runs and report its usage. Unbounded unless maxsize given.
     """
-    timing_data = []
-    test_calls = []
-    for answer in get_all_days(False, True):
-        assert answer.function_name is not None
-        if days and answer.module_name not in days:
+
+    def decorator(func: Callable[..., T]) -> functools._lru_cache_wrapper[T]:
+        wrapper = functools.lru_cache(maxsize=maxsize)(func)
+        _CACHES[f"{func.__module__}.{func.__qualname__}"] = wrapper
+        return wrapper
+
+    return decorator
+
+
+def _cache_bytes(wrapper: functools._lru_cache_wrapper[Any]) -> int:
+    # lru_cache doesn't expose its dict but it is the GC referent that isn't
+    # the wrapper's __dict__. Only a shallow estimate of the keys and values.
+    for referent in gc.get_referents(wrapper):
+        if isinstance(referent, dict) and referent is not wrapper.__dict__:
+            return sys.getsizeof(referent) + sum(
+                sys.getsizeof(key) + sys.getsizeof(value)
+                for key, value in referent.items()
+            )
+    return 0
+
+
+def cache_stats(module_name: str = "") -> list[CacheStats]:
+    """Stats for all registered caches, or just those of the given module."""
+    stats = []
+    for name, wrapper in _CACHES.items():
+        if module_name and not name.startswith(module_name + "."):
             continue
-        day_mod = importlib.__import__(answer.module_name)
-        part_function = getattr(day_mod, answer.function_name)
-        ti = timeit.Timer(lambda: part_function(answer.input_file))
-        num_calls, time_taken = ti.autorange()
-        timing_data.append(
-            (time_taken / num_calls, num_calls, time_taken, answer.module_name)
+        info = wrapper.cache_info()
+        stats.append(
+            CacheStats(
+                name,
+                info.hits,
+                info.misses,
+                info.currsize,
+                info.maxsize,
+                _cache_bytes(wrapper),
+            )
         )
-        test_calls.append((part_function, answer.input_file))
+    return stats
 
-    # Now run all days together
-    ALL_COUNT = 1
-    all_days = timeit.timeit(
-        lambda: [day(input) for day, input in test_calls], number=ALL_COUNT
-    )
 
-    for avg_time, num_calls, total_time, day in sorted(timing_data, reverse=True):
-        print(f"{day} avg {avg_time:.9f} ({num_calls} calls in {total_time:.9f})")
+def clear_caches() -> None:
+    for wrapper in _CACHES.values():
+        wrapper.cache_clear()
+
+
+def parser(func: Callable[[Path], T]) -> Callable[[Path], T]:
+    """
+    Declare func as the parse function of a day. With AOC_PARSE_CACHE=1 in
+    the environment, e.g. from --parse-cache, what it returns is stored on
+    disk by the harness, keyed on the input and the day's source, and loaded
+    rather than parsing again. Results that can't be pickled aren't stored.
+    The "freeze" GC tuning freezes the GC once it returns.
+    """
+
+    @functools.wraps(func)
+    def wrapper(input_file: Path) -> T:
+        if os.environ.get("AOC_PARSE_CACHE") == "1":
+            import harness
+
+            parsed: T = harness.cached_parse(func, input_file)
+        else:
+            parsed = func(input_file)
+        if _gc_freeze_after_parse:
+            # Leave what was parsed out of the collections while solving
+            gc.freeze()
+        return parsed
+
+    return wrapper
+
+
+_gc_freeze_after_parse = False
+
 
-    print(
-        f"All {len(test_calls)} days take {all_days / ALL_COUNT:.9f} on average ({ALL_COUNT} calls in {all_days:.9f})"
+def freeze_gc_after_parse(freeze: bool = True) -> None:
+    """Have the utils.parser functions call gc.freeze() when they return."""
+    global _gc_freeze_after_parse
+    _gc_freeze_after_parse = freeze
+
+
+_IMPLEMENTATIONS: dict[str, list[Callable[[Path], Any]]] = {}
+
+
+def implementation(
+    of: str,
+) -> Callable[[Callable[[Path], T]], Callable[[Path], T]]:
+    """
+    Register the decorated function as another implementation of the named
+    function of the same day, e.g. a faster rewrite. python -m utils ab checks
+    that they agree on every input and benchmarks them side by side.
+    """
+
+    def decorator(func: Callable[[Path], T]) -> Callable[[Path], T]:
+        _IMPLEMENTATIONS.setdefault(f"{func.__module__}.{of}", []).append(func)
+        return func
+
+    return decorator
+
+
+def implementations(
+    module_name: str, function_name: str
+) -> list[Callable[[Path], Any]]:
+    """The named function of the day followed by its other implementations."""
+    day_mod = sys.modules[module_name]
+    return [
+        getattr(day_mod, function_name),
+        *_IMPLEMENTATIONS.get(f"{module_name}.{function_name}", ()),
+    ]
+
+
+# Inputs are read once and shared by the parts of a day and its repeated runs
+# until the caches are cleared, keyed on the modification time and size too so
+# that a changed input is read again
+
+
+def _input_key(input_file: Path) -> tuple[Path, int, int]:
+    stat = input_file.stat()
+    return input_file, stat.st_mtime_ns, stat.st_size
+
+
+@memoize(maxsize=8)
+def _mapped_input(input_file: Path, mtime_ns: int, size: int) -> mmap.mmap | bytes:
+    if not size:  # Empty files can't be mapped
+        return b""
+    with input_file.open("rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@memoize(maxsize=8)
+def _input_text(input_file: Path, mtime_ns: int, size: int) -> str:
+    return str(_mapped_input(input_file, mtime_ns, size), "utf-8")
+
+
+@memoize(maxsize=8)
+def _input_lines(input_file: Path, mtime_ns: int, size: int) -> tuple[str, ...]:
+    return tuple(_input_text(input_file, mtime_ns, size).splitlines())
+
+
+def input_bytes(input_file: Path) -> memoryview:
+    """The input memory mapped read only, so slices of it aren't copies."""
+    return memoryview(_mapped_input(*_input_key(input_file)))
+
+
+def input_text(input_file: Path) -> str:
+    return _input_text(*_input_key(input_file))
+
+
+def input_lines(input_file: Path) -> tuple[str, ...]:
+    """The lines of the input, a tuple as it is shared by every caller."""
+    return _input_lines(*_input_key(input_file))
+
+
+def grid_cells(input_file: Path) -> int:
+    """Cells in a grid input, the work units of the grid days."""
+    return sum(map(len, input_lines(input_file)))
+
+
+def iter_input_lines(input_file: Path) -> Iterator[str]:
+    """Decode the lines of the mapped input one at a time as they are needed."""
+    data = _mapped_input(*_input_key(input_file))
+    start = 0
+    while start < len(data):
+        end = data.find(b"\n", start)
+        if end < 0:
+            end = len(data)
+        yield str(data[start:end], "utf-8").removesuffix("\r")
+        start = end + 1
+
+
+class PhaseTime(NamedTuple):
+    """Total time spent in a named phase of a day."""
+
+    name: str
+    total_time: float
+    calls: int
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.calls
+
+
+# None when phase timing is disabled, so phase() is almost free
+_phase_times: dict[str, PhaseTime] | None = None
+_trace_events: list[dict[str, Any]] | None = None
+_NO_PHASE = contextlib.nullcontext()
+
+
+class _Phase:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        duration = time.perf_counter() - self.start
+        if _phase_times is None:
+            return
+        prev = _phase_times.get(self.name)
+        _phase_times[self.name] = PhaseTime(
+            self.name,
+            duration + (prev.total_time if prev else 0.0),
+            1 + (prev.calls if prev else 0),
+        )
+        if _trace_events is not None:
+            # Chrome trace event format complete event, times in microseconds
+            _trace_events.append(
+                {
+                    "name": self.name,
+                    "ph": "X",
+                    "ts": self.start * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+            )
+
+
+def phase(name: str) -> contextlib.AbstractContextManager[None]:
+    """
+    Time the body of a with statement as a named phase of a day, for example
+    parse, p1 and p2. Does nothing unless enable_phases has been called.
+    """
+    return _NO_PHASE if _phase_times is None else _Phase(name)
+
+
+def enable_phases(trace: bool = False) -> None:
+    global _phase_times, _trace_events
+    _phase_times = {}
+    _trace_events = [] if trace else None
+
+
+def disable_phases() -> None:
+    global _phase_times, _trace_events
+    _phase_times = _trace_events = None
+
+
+def collect_phases() -> tuple[list[PhaseTime], list[dict[str, Any]]]:
+    """Return the phase times and trace events so far and reset them."""
+    phase_times = list(_phase_times.values()) if _phase_times is not None else []
+    trace_events = list(_trace_events) if _trace_events is not None else []
+    if _phase_times is not None:
+        enable_phases(_trace_events is not None)
+    return phase_times, trace_events
+
+
+_counters: dict[str, int] | None = None
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Add to a named counter of the work a day does, for example heap pushes.
+    Does nothing unless enable_counters has been called, but still costs a
+    call so in the hottest loops prefer adding up a size once at the end.
+    """
+    if _counters is not None:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def gauge(name: str, value: int) -> None:
+    """Record the highest value seen of a named gauge, e.g. a visited set size."""
+    if _counters is not None:
+        _counters[name] = max(value, _counters.get(name, value))
+
+
+def counters_enabled() -> bool:
+    """Whether to work out a value to count when that takes more than a call."""
+    return _counters is not None
+
+
+def enable_counters() -> None:
+    global _counters
+    _counters = {}
+
+
+def disable_counters() -> None:
+    global _counters
+    _counters = None
+
+
+def collect_counters() -> dict[str, int]:
+    """Return the counters and gauges so far and reset them."""
+    if _counters is None:
+        return {}
+    counters = dict(sorted(_counters.items()))
+    _counters.clear()
+    return counters
+
+
+def per_day_main(
+    part_function: Any,
+    input_file: str = "",
+) -> None:
+    import harness
+
+    day = Path(sys._getframe(1).f_code.co_filename).stem
+    sys.exit(harness.per_day_main(part_function, day, input_file))
+
+
+async def solve(
+    day: str,
+    input_file: Path | None = None,
+    *,
+    function_name: str | None = None,
+    executor: SolveExecutor | None = None,
+) -> Any:
+    """
+    Solve a day from asyncio in a process pool, defaulting to the real input
+    and the function in the answers. Pass a harness.SolveExecutor to limit how
+    many solves run at once, its as_completed streams results as they finish.
+    """
+    import harness
+
+    return await harness.solve(
+        day, input_file, function_name=function_name, executor=executor
     )
-    return
 
 
 if __name__ == "__main__":
-    _run_all(sys.argv[1:])
+    # Run the harness on the importable utils module rather than __main__ so
+    # that state the days register, like caches, is seen by the runner
+    import harness
+
+    sys.exit(harness._main(sys.argv[1:]))